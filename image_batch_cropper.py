@@ -3,69 +3,379 @@ import sys
 import os
 import subprocess
 import tempfile
+import shutil
 import re
 import threading
-import time
-from pathlib import Path
+import itertools
+import functools
+import json
+import struct
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import namedtuple, OrderedDict, defaultdict
+from contextlib import contextmanager
 from typing import List, Optional, Tuple
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QFileDialog, QListWidget, QLabel, QScrollArea,
-    QSplitter, QMessageBox, QSpinBox, QGroupBox, QListWidgetItem,
-    QCheckBox, QProgressDialog, QMenu, QAbstractItemView, QComboBox
+    QPushButton, QFileDialog, QListView, QLabel,
+    QSplitter, QMessageBox, QSpinBox, QGroupBox, QStyledItemDelegate,
+    QCheckBox, QProgressDialog, QMenu, QAbstractItemView, QComboBox, QStyle
+)
+from PySide6.QtCore import (
+    Qt, QRect, QPoint, Signal, QSize, QRectF, QPointF, QTimer, QThread,
+    QObject, QRunnable, QThreadPool, QElapsedTimer, QEvent, QAbstractListModel, QModelIndex
+)
+from PySide6.QtGui import (
+    QPixmap, QPainter, QPen, QColor, QImage, QBrush, QCursor, QImageReader, QImageIOHandler,
+    QTransform, QPainterPath, QPixmapCache, QFont, QFontMetrics
 )
-from PySide6.QtCore import Qt, QRect, QPoint, Signal, QSize, QRectF, QPointF, QTimer, QThread
-from PySide6.QtGui import QPixmap, QPainter, QPen, QColor, QImage, QBrush, QCursor
 import cv2
 import numpy as np
 
+try:
+    import av  # PyAV（任意）：動画の最初のフレームを軽量に取り出す
+except ImportError:
+    av = None
+
+
+@contextmanager
+def block_signals(*widgets):
+    """指定したウィジェットのシグナルを一時的にブロック（終了時に元の状態へ戻す）"""
+    previous = [widget.blockSignals(True) for widget in widgets]
+    try:
+        yield
+    finally:
+        for widget, was_blocked in zip(widgets, previous):
+            widget.blockSignals(was_blocked)
+
+
+@contextmanager
+def suspend_updates(*widgets):
+    """指定したウィジェットの再描画を一時停止（終了時にまとめて再描画される）"""
+    previous = [widget.updatesEnabled() for widget in widgets]
+    for widget in widgets:
+        widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        for widget, was_enabled in zip(widgets, previous):
+            widget.setUpdatesEnabled(was_enabled)
+
+
+# 対応する拡張子（小文字）
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v'})
+IMAGE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.bmp', '.gif'})
+MEDIA_EXTENSIONS = VIDEO_EXTENSIONS | IMAGE_EXTENSIONS
+
+
+def get_extension(file_path: str) -> str:
+    """小文字の拡張子を取得"""
+    return os.path.splitext(file_path)[1].lower()
+
 
 def is_video_file(file_path: str) -> bool:
     """ファイルが動画かどうかを判定"""
-    video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v'}
-    return Path(file_path).suffix.lower() in video_extensions
+    return get_extension(file_path) in VIDEO_EXTENSIONS
 
 
 def is_image_file(file_path: str) -> bool:
     """ファイルが画像かどうかを判定"""
-    image_extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.gif'}
-    return Path(file_path).suffix.lower() in image_extensions
+    return get_extension(file_path) in IMAGE_EXTENSIONS
+
+
+def is_media_file(file_path: str) -> bool:
+    """ファイルが画像または動画かどうかを判定"""
+    return get_extension(file_path) in MEDIA_EXTENSIONS
+
+
+# 画像ファイルのメタ情報（formatはQImageReaderが判定した形式、mtimeは取得時の更新日時）
+ImageMeta = namedtuple('ImageMeta', ['width', 'height', 'format', 'mtime'])
+
+# リストに追加したファイルの情報（sizeは (width, height)、file_typeは 'image' or 'video'、image_metaは画像のみ）
+FileMeta = namedtuple('FileMeta', ['size', 'file_type', 'image_meta'])
+
+
+def probe_image(file_path: str) -> Optional[ImageMeta]:
+    """画像のヘッダーだけを読んでサイズと形式を取得（ピクセルはデコードしない）"""
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        return None
+
+    reader = QImageReader(file_path)
+    size = reader.size()
+    if not size.isValid():
+        return None
+
+    # 読み込み時に回転が適用される場合（EXIFの向き情報）は幅と高さを入れ替える
+    width, height = size.width(), size.height()
+    if reader.autoTransform() and reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90:
+        width, height = height, width
+
+    return ImageMeta(width, height, reader.format().data(), mtime)
+
+
+def load_image(file_path: str, meta: Optional[ImageMeta] = None) -> QImage:
+    """画像をデコードして返す
+
+    追加時に取得したメタ情報があり、その後ファイルが更新されていなければ、
+    判定済みの形式を指定して形式の再判定を省く。
+    """
+    reader = QImageReader(file_path)
+    if meta is not None:
+        try:
+            if os.path.getmtime(file_path) == meta.mtime:
+                reader.setFormat(meta.format)
+        except OSError:
+            pass
+    return reader.read()
+
+
+def crop_image_view(image: QImage, rect: QRect) -> QImage:
+    """QImageの指定範囲を参照するQImageを作成（ピクセルデータをコピーしない）
+
+    返すQImageは元のimageのバッファを参照するだけで、imageの寿命は延ばさない。
+    呼び出し側は、返したQImageを使い終わるまでimageへの参照を持ち続けること。
+    1ピクセルが1バイトに満たない形式（モノクロ等）は従来通りcopy()で切り出す。
+    """
+    rect = rect.intersected(image.rect())
+    depth = image.depth()
+    if rect.isEmpty() or depth < 8 or depth % 8:
+        return image.copy(rect)
+
+    # 切り抜き範囲の左上からのバッファを、元画像と同じ行ストライドで参照する
+    offset = rect.y() * image.bytesPerLine() + rect.x() * (depth // 8)
+    view = QImage(image.constBits()[offset:], rect.width(), rect.height(),
+                  image.bytesPerLine(), image.format())
+    if image.colorCount() > 0:
+        view.setColorTable(image.colorTable())  # インデックスカラー（GIF等）
+    return view
+
+
+# ffprobeの結果のキャッシュ {(file_path, mtime): info}
+_probe_cache = {}
+PROBE_CACHE_SIZE = 1024  # キャッシュする動画数の上限（古いものから破棄）
+_probe_cache_lock = threading.Lock()  # ファイル追加時は複数のワーカースレッドから更新される
+
+
+def parse_frame_rate(value: str) -> float:
+    """ffprobeのフレームレート表記（例: '30000/1001'）を数値に変換"""
+    num, _, den = value.partition('/')
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def parse_int(value) -> int:
+    """ffprobeの数値文字列を整数に変換（'N/A'などは0）"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def get_stream_rotation(stream: dict) -> int:
+    """ffprobeの映像ストリーム情報から回転角度（度）を取得"""
+    rotation = stream.get('tags', {}).get('rotate', 0)
+    for side_data in stream.get('side_data_list', []):
+        rotation = side_data.get('rotation', rotation)
+    try:
+        return int(float(rotation)) % 360
+    except (TypeError, ValueError):
+        return 0
+
+
+def probe_video(video_path: str) -> Optional[dict]:
+    """ffprobeを1回だけ実行して動画の情報を取得（パスと更新日時をキーにキャッシュ）
+
+    戻り値は {'width', 'height', 'duration', 'start_time', 'codec', 'fps', 'bit_rate', 'stream', 'audio_stream'}。
+    width/heightは回転を適用した表示上のサイズ、streamは映像ストリームの生の情報。
+    duration・start_timeはコンテナ（format）の値。
+    fps・bit_rateは取得できなければ0。
+    audio_streamは最初の音声ストリーム（なければNone）。
+    ffprobeが使えない場合はNone。
+    """
+    try:
+        key = (video_path, os.path.getmtime(video_path))
+    except OSError:
+        return None
+    with _probe_cache_lock:
+        cached = _probe_cache.get(key)
+    if cached is not None:
+        return cached
+
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-print_format', 'json',
+        '-show_streams',
+        '-show_format',
+        video_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        data = json.loads(result.stdout)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    stream = next((s for s in data.get('streams', []) if s.get('codec_type') == 'video'), None)
+    if stream is None:
+        return None
+
+    width, height = int(stream.get('width', 0)), int(stream.get('height', 0))
+    if get_stream_rotation(stream) in (90, 270):
+        width, height = height, width
+    try:
+        duration = float(data.get('format', {}).get('duration', 0.0))
+    except ValueError:
+        duration = 0.0
+    try:
+        start_time = float(data.get('format', {}).get('start_time', 0.0))
+    except ValueError:
+        start_time = 0.0
+
+    audio_stream = next((s for s in data.get('streams', []) if s.get('codec_type') == 'audio'), None)
+
+    info = {'width': width, 'height': height, 'duration': duration, 'start_time': start_time,
+            'codec': stream.get('codec_name', ''),
+            'fps': parse_frame_rate(stream.get('avg_frame_rate') or stream.get('r_frame_rate', '')),
+            'bit_rate': parse_int(stream.get('bit_rate') or data.get('format', {}).get('bit_rate')),
+            'stream': stream, 'audio_stream': audio_stream}
+    with _probe_cache_lock:
+        if len(_probe_cache) >= PROBE_CACHE_SIZE:
+            del _probe_cache[next(iter(_probe_cache))]  # 最も古いエントリを破棄
+        _probe_cache[key] = info
+    return info
 
 
 def extract_first_frame(video_path: str) -> Optional[QImage]:
     """動画から最初のフレームを抽出してQImageとして返す"""
+    info = probe_video(video_path)
+    # PyAVがあればプロセスを起動せずにデコード（PyAVは回転を適用しないので回転のない動画のみ。
+    # ffprobeがなく回転が分からない場合は、サイズを取得したOpenCVと同じく回転を適用する方法で抽出する）
+    if av is not None and info and get_stream_rotation(info['stream']) == 0:
+        q_image = extract_first_frame_av(video_path)
+        if q_image:
+            return q_image
+    # ffprobeのキャッシュ済みサイズがあれば、ffmpegからRGBの生データを直接受け取る
+    if info:
+        q_image = extract_first_frame_ffmpeg(video_path, info['width'], info['height'])
+        if q_image:
+            return q_image
+    # サイズ取得時にOpenCVで一緒に読み込んだフレームがあれば使う
+    q_image = pop_cached_first_frame(video_path)
+    if q_image:
+        return q_image
+    # ffmpegが使えない場合はOpenCVで抽出
+    return extract_first_frame_cv2(video_path)
+
+
+def extract_first_frame_av(video_path: str) -> Optional[QImage]:
+    """PyAVで最初のフレームだけをデコードしてQImageにする"""
+    try:
+        with av.open(video_path) as container:
+            stream = container.streams.video[0]
+            stream.thread_type = 'NONE'  # 1フレームだけなのでデコードスレッドを起動しない
+            frame = next(container.decode(stream), None)
+            if frame is None:
+                return None
+            rgb = frame.to_ndarray(format='rgb24')
+    except Exception as e:
+        print(f"Error extracting frame with PyAV from {video_path}: {e}")
+        return None
+
+    height, width = rgb.shape[:2]
+    # QImageがデータを持つようにコピーする（numpyのバッファを参照したままにしない）
+    return QImage(rgb.data, width, height, rgb.strides[0], QImage.Format.Format_RGB888).copy()
+
+
+def extract_first_frame_ffmpeg(video_path: str, width: int, height: int) -> Optional[QImage]:
+    """ffmpegで最初のフレームをRGB24の生データとして出力させてQImageにする"""
+    cmd = [
+        'ffmpeg',
+        '-v', 'error',
+        '-ss', '0',
+        '-i', video_path,
+        '-frames:v', '1',
+        '-f', 'rawvideo',
+        '-pix_fmt', 'rgb24',
+        '-'
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True)
+    except FileNotFoundError:
+        return None
+
+    # 想定サイズと出力が一致しない場合（回転の扱いの違いなど）は使わない
+    bytes_per_line = width * 3
+    data = result.stdout
+    if result.returncode != 0 or width <= 0 or height <= 0 or len(data) != bytes_per_line * height:
+        return None
+
+    # QImageがデータを持つようにコピーする（出力のbytesを参照したままにしない）
+    return QImage(data, width, height, bytes_per_line, QImage.Format.Format_RGB888).copy()
+
+
+def extract_first_frame_cv2(video_path: str) -> Optional[QImage]:
+    """OpenCVで動画から最初のフレームを抽出してQImageとして返す"""
+    return probe_and_thumbnail(video_path)[0]
+
+
+def probe_and_thumbnail(video_path: str) -> Tuple[Optional[QImage], Optional[Tuple[int, int]]]:
+    """OpenCVで動画を1回だけ開き、最初のフレームとサイズ（幅、高さ）を取得"""
     try:
         cap = cv2.VideoCapture(video_path)
+        size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
         ret, frame = cap.read()
         cap.release()
 
         if not ret or frame is None:
-            return None
+            return None, size
 
-        # BGR -> RGB変換
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        height, width, channel = frame_rgb.shape
-        bytes_per_line = channel * width
-
-        # QImageに変換
-        q_image = QImage(frame_rgb.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-        return q_image.copy()  # データのコピーを返す
+        # BGRのままQImageで包み、RGB888への変換でQImage自身のバッファへ1回だけ書き出す
+        height, width = frame.shape[:2]
+        q_image = QImage(frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888).convertToFormat(QImage.Format.Format_RGB888)
+        return q_image, size
     except Exception as e:
         print(f"Error extracting frame from {video_path}: {e}")
+        return None, None
+
+
+# サイズ取得時にOpenCVで読み込んだ最初のフレーム {(video_path, mtime): QImage}
+_first_frame_cache = {}
+FIRST_FRAME_CACHE_SIZE = 4
+_first_frame_cache_lock = threading.Lock()  # サイズ取得・画像読み込みのワーカースレッドから更新される
+
+
+def pop_cached_first_frame(video_path: str) -> Optional[QImage]:
+    """キャッシュ済みの最初のフレームを取り出す（取り出したものはキャッシュから消える）"""
+    try:
+        key = (video_path, os.path.getmtime(video_path))
+    except OSError:
         return None
+    with _first_frame_cache_lock:
+        return _first_frame_cache.pop(key, None)
 
 
 def get_video_info(video_path: str) -> Optional[Tuple[int, int]]:
     """動画のサイズ（幅、高さ）を取得"""
-    try:
-        cap = cv2.VideoCapture(video_path)
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        cap.release()
-        return (width, height)
-    except Exception as e:
-        print(f"Error getting video info from {video_path}: {e}")
-        return None
+    info = probe_video(video_path)
+    if info:
+        return (info['width'], info['height'])
+
+    # ffprobeが使えない場合はOpenCVで取得（開いたついでに最初のフレームも読み込む）
+    q_image, size = probe_and_thumbnail(video_path)
+    # 表示時に同じ動画をもう一度開かないようにフレームを保持
+    # リストの先頭から表示されることが多いので、先に追加されたものを優先して上限まで保持する
+    if q_image:
+        try:
+            key = (video_path, os.path.getmtime(video_path))
+        except OSError:
+            return size
+        with _first_frame_cache_lock:
+            if len(_first_frame_cache) < FIRST_FRAME_CACHE_SIZE:
+                _first_frame_cache[key] = q_image
+    return size
 
 
 def check_ffmpeg_available() -> bool:
@@ -91,120 +401,527 @@ def check_nvenc_available() -> bool:
         return False
 
 
+_cuda_crop_available = None  # check_cuda_crop_availableの結果のキャッシュ
+
+
+def check_cuda_crop_available() -> bool:
+    """CUDA上でクロップするフィルター（crop_cuda）が使えるか確認（結果はキャッシュ）"""
+    global _cuda_crop_available
+    if _cuda_crop_available is None:
+        try:
+            result = subprocess.run(
+                ['ffmpeg', '-hide_banner', '-filters'],
+                capture_output=True,
+                text=True
+            )
+            _cuda_crop_available = re.search(r'\bcrop_cuda\b', result.stdout) is not None
+        except FileNotFoundError:
+            _cuda_crop_available = False
+    return _cuda_crop_available
+
+
 def get_video_duration(file_path: str) -> float:
     """動画の長さ（秒）を取得"""
+    info = probe_video(file_path)
+    return info['duration'] if info else 0.0
+
+
+def claim_unique_save_path(folder: str, name: str, ext: str) -> str:
+    """重複しない保存先パスを確保して返す
+
+    O_CREAT|O_EXCLで空ファイルを作成して名前を確保するため、存在チェックと
+    保存の間に同名ファイルが作られる競合が起きない（既存ファイルがあれば連番を付ける）。
+    """
+    for counter in itertools.count():
+        suffix = "_cropped" if counter == 0 else f"_cropped_{counter}"
+        save_path = os.path.join(folder, f"{name}{suffix}{ext}")
+        try:
+            # O_BINARYはWindowsのみ（改行変換なしで開く。他のOSでは0）
+            fd = os.open(save_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0))
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return save_path
+
+
+def remove_file_quietly(file_path: str):
+    """ファイルが存在すれば削除（失敗しても無視）"""
     try:
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            file_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        return float(result.stdout.strip())
-    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
-        return 0.0
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    except OSError:
+        pass
 
 
-def crop_video_with_ffmpeg(input_path: str, output_path: str, x: int, y: int, width: int, height: int,
-                           use_gpu: bool = False, progress_callback=None, cancel_check=None) -> bool:
-    """ffmpegを使用して動画をトリミング
+JPEG_EXTENSIONS = frozenset({'.jpg', '.jpeg'})
+# フレームの情報（サイズ・色成分のサンプリング比）を持つSOFマーカー（C4: DHT, C8: JPG, CC: DACは除く）
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# 長さを持たないマーカー（TEM, RST0〜7, SOI）
+JPEG_STANDALONE_MARKERS = frozenset({0x01, 0xD8}) | frozenset(range(0xD0, 0xD8))
 
-    Args:
-        input_path: 入力動画のパス
-        output_path: 出力動画のパス
-        x, y, width, height: トリミング範囲
-        use_gpu: GPU（NVENC）エンコードを使用するか
-        progress_callback: 進捗コールバック関数 (percent: float) -> None
-        cancel_check: キャンセルチェック関数 () -> bool（Trueならキャンセル）
+_jpegtran_available = None  # check_jpegtran_availableの結果のキャッシュ
+
+
+def check_jpegtran_available() -> bool:
+    """jpegtranが利用可能かチェック（結果はキャッシュ）"""
+    global _jpegtran_available
+    if _jpegtran_available is None:
+        _jpegtran_available = shutil.which('jpegtran') is not None
+    return _jpegtran_available
+
+
+def read_jpeg_mcu_size(file_path: str) -> Optional[Tuple[int, int]]:
+    """JPEGのSOFマーカーからiMCU（jpegtranが切り抜ける単位）の幅と高さを読み取る（読めなければNone）
+
+    サンプリング比で決まり、4:2:0なら16x16、4:2:2なら16x8、4:1:1なら32x8、グレースケールなら8x8。
     """
-    process = None
     try:
-        # 動画の長さを取得
-        duration = get_video_duration(input_path)
+        with open(file_path, 'rb') as f:
+            if f.read(2) != b'\xff\xd8':
+                return None
+            while True:
+                if f.read(1) != b'\xff':
+                    return None
+                marker = f.read(1)
+                while marker == b'\xff':  # 詰め物の0xFF
+                    marker = f.read(1)
+                if not marker:
+                    return None
+                code = marker[0]
+                if code in JPEG_STANDALONE_MARKERS:
+                    continue
+                if code in (0xD9, 0xDA):  # SOF より先に EOI・SOS が来た
+                    return None
+                length = struct.unpack('>H', f.read(2))[0]
+                if code not in JPEG_SOF_MARKERS:
+                    f.seek(length - 2, os.SEEK_CUR)
+                    continue
+                # 精度(1) 高さ(2) 幅(2) 成分数(1)、成分ごとに ID(1) サンプリング比(1) 量子化テーブル(1)
+                data = f.read(length - 2)
+                count = data[5]
+                if count == 1:
+                    return 8, 8
+                factors = [data[6 + 3 * i + 1] for i in range(count)]
+                return max(factor >> 4 for factor in factors) * 8, max(factor & 0x0F for factor in factors) * 8
+    except (OSError, IndexError, struct.error):
+        return None
 
-        cmd = [
-            'ffmpeg',
-            '-i', input_path,
-            '-vf', f'crop={width}:{height}:{x}:{y}',
-        ]
 
-        # GPUエンコードが利用可能かつ指定されている場合
-        if use_gpu:
-            # NVENCのパラメータを最適化
-            cmd.extend([
-                '-c:v', 'h264_nvenc',
-                '-preset', 'medium',  # slow, medium, fast, hp, hq, bd, ll, llhq, llhp, lossless
-                '-cq', '23',  # 品質（0-51、低いほど高品質）
-                '-b:v', '0'   # VBRモード
-            ])
+def crop_jpeg_lossless(file_path: str, rect: QRect, save_path: str) -> bool:
+    """jpegtranでJPEGをDCT係数のまま切り抜く（デコード・再エンコードなし、画質劣化なし）
 
-        cmd.extend([
-            '-c:a', 'copy',  # 音声はそのままコピー
-            '-y',  # 上書き確認なし
-            output_path
+    左上がMCU境界に揃っていない場合（jpegtranが範囲を広げてしまう）、EXIFの向き情報がある場合、
+    jpegtranが使えない場合はFalseを返すので、通常の方法で切り抜くこと。
+    """
+    if get_extension(file_path) not in JPEG_EXTENSIONS or not check_jpegtran_available():
+        return False
+    # EXIFの向き情報で回転・反転して表示される画像は、切り抜き範囲（表示座標）と
+    # jpegtranが扱う保存された画素の座標が一致せず、向き情報も残らないので対象外
+    if QImageReader(file_path).transformation() != QImageIOHandler.Transformation.TransformationNone:
+        return False
+    mcu_size = read_jpeg_mcu_size(file_path)
+    if mcu_size is None or rect.x() % mcu_size[0] or rect.y() % mcu_size[1]:
+        return False
+
+    cmd = [
+        'jpegtran',
+        '-crop', f'{rect.width()}x{rect.height()}+{rect.x()}+{rect.y()}',
+        '-copy', 'none',  # QImageで保存した場合と同じくメタデータは付けない
+        '-outfile', save_path,
+        file_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True)
+    except OSError:
+        return False
+    return result.returncode == 0
+
+
+# 非圧縮BMPの圧縮形式（BI_RGB, BI_BITFIELDS, BI_ALPHABITFIELDS）とバイト単位で切り抜けるビット数
+BMP_UNCOMPRESSED = frozenset({0, 3, 6})
+BMP_BYTE_ALIGNED_BPP = frozenset({8, 16, 24, 32})
+
+
+def crop_bmp_uncompressed(file_path: str, rect: QRect, save_path: str) -> bool:
+    """非圧縮BMPをデコードせずに切り抜く（ファイルをメモリマップし、必要な行・列だけをコピー）
+
+    ヘッダー（パレット・ビットマスクを含む）はそのままコピーしてサイズだけ書き換える。
+    圧縮されている、1ピクセルが1バイト未満、ICCプロファイルを埋め込んでいる場合などはFalse。
+    """
+    if get_extension(file_path) != '.bmp':
+        return False
+    try:
+        with open(file_path, 'rb') as f:
+            file_header = f.read(14)
+            if len(file_header) < 14 or file_header[:2] != b'BM':
+                return False
+            data_offset = struct.unpack_from('<I', file_header, 10)[0]
+            header = file_header + f.read(data_offset - 14)
+        if len(header) != data_offset or data_offset < 54:
+            return False
+
+        dib_size, width, height, _, bpp, compression = struct.unpack_from('<IiiHHI', header, 14)
+        if dib_size < 40 or compression not in BMP_UNCOMPRESSED or bpp not in BMP_BYTE_ALIGNED_BPP:
+            return False
+        # V5ヘッダーの埋め込みプロファイル（'MBED'）はピクセルデータの後ろにあるので扱わない
+        if dib_size >= 124 and header[70:74] == b'DEBM':
+            return False
+
+        rows = abs(height)
+        x, y, crop_w, crop_h = rect.x(), rect.y(), rect.width(), rect.height()
+        if x < 0 or y < 0 or crop_w <= 0 or crop_h <= 0 or x + crop_w > width or y + crop_h > rows:
+            return False
+
+        bytes_per_pixel = bpp // 8
+        stride = (width * bpp + 31) // 32 * 4
+        crop_stride = (crop_w * bpp + 31) // 32 * 4
+        # 高さが正ならボトムアップ（ファイルの先頭が画像の最下行）
+        first_row = rows - y - crop_h if height > 0 else y
+
+        pixels = np.memmap(file_path, dtype=np.uint8, mode='r', offset=data_offset, shape=(rows, stride))
+        try:
+            cropped = np.zeros((crop_h, crop_stride), dtype=np.uint8)
+            cropped[:, :crop_w * bytes_per_pixel] = pixels[
+                first_row:first_row + crop_h,
+                x * bytes_per_pixel:(x + crop_w) * bytes_per_pixel
+            ]
+        finally:
+            del pixels  # Windowsではマップを閉じないとファイルが解放されない
+
+        out_header = bytearray(header)
+        struct.pack_into('<I', out_header, 2, data_offset + cropped.nbytes)  # ファイルサイズ
+        struct.pack_into('<ii', out_header, 18, crop_w, crop_h if height > 0 else -crop_h)
+        struct.pack_into('<I', out_header, 34, cropped.nbytes)  # ピクセルデータのサイズ
+        with open(save_path, 'wb') as f:
+            f.write(out_header)
+            f.write(cropped.tobytes())
+        return True
+    except (OSError, ValueError, struct.error):
+        return False
+
+
+def crop_and_save_image(file_path: str, rect: QRect, folder: str,
+                        meta: Optional[ImageMeta] = None, image: Optional[QImage] = None) -> bool:
+    """画像を読み込んで切り抜き、保存先フォルダに保存（ワーカースレッドから呼ばれる）
+
+    imageにデコード済みの画像（プレビュー用に読み込んだものなど）を渡すと、読み込みを省く。
+    """
+    name, ext = os.path.splitext(os.path.basename(file_path))
+    try:
+        save_path = claim_unique_save_path(folder, name, ext)
+    except OSError as e:
+        # 書き込めないフォルダ・容量不足など（保存できなかったファイルとして扱う）
+        print(f"エラー: 保存先のファイルを作成できません: {file_path} - {e}")
+        return False
+
+    try:
+        # JPEG・非圧縮BMPは可能ならデコードせずに切り抜く
+        if crop_jpeg_lossless(file_path, rect, save_path) or crop_bmp_uncompressed(file_path, rect, save_path):
+            return True
+
+        if image is None:
+            image = load_image(file_path, meta)
+        if not image.isNull():
+            # 元画像のバッファを直接参照する。croppedはこの関数の中だけで使い、
+            # その間imageはローカル変数として参照され続ける
+            cropped = crop_image_view(image, rect)
+            saved = cropped.save(save_path)
+            del cropped  # imageより先に手放す
+            if saved:
+                return True
+    except OSError as e:
+        print(f"エラー: 画像の切り抜き中に問題が発生しました: {file_path} - {e}")
+
+    # 確保した空ファイルを残さない
+    remove_file_quietly(save_path)
+    return False
+
+
+# ビットストリームのクロップ情報を書き換えられるコーデックと対応するbsf
+BITSTREAM_CROP_FILTERS = {'h264': 'h264_metadata', 'hevc': 'hevc_metadata'}
+BITSTREAM_CROP_ALIGN = 16  # マクロブロック境界
+BITSTREAM_CROP_UNIT = 2  # クロップ情報の単位（4:2:0の色差の間引き）
+
+
+def video_has_size(video_path: str, width: int, height: int) -> bool:
+    """出力した動画のサイズ（ffprobeで取得）が指定どおりか確認"""
+    info = probe_video(video_path)
+    return bool(info) and (info['width'], info['height']) == (width, height)
+
+
+def build_bitstream_crop_args(stream: dict, x: int, y: int, width: int, height: int) -> Optional[List[str]]:
+    """再エンコードなし（-c copy）で切り抜ける場合はffmpeg引数を返す
+
+    H.264/HEVCのクロップ情報だけを書き換えるため画質劣化がなく、I/O速度で処理できる。
+    コーデックが非対応、回転情報付き、符号化サイズが不明、
+    または範囲がマクロブロック境界に揃っていない場合はNone。
+
+    crop_*は元のストリームのクロップ情報に加算されず置き換えるため、
+    符号化サイズ（1080pなら1920x1088）を基準に計算する。
+    元のクロップは右端・下端の詰め物（符号化の都合で足された行・列）とみなす。
+    """
+    bsf = BITSTREAM_CROP_FILTERS.get(stream.get('codec_name'))
+    if not bsf:
+        return None
+
+    # 回転情報がある動画は表示座標とストリーム座標が一致しないため対象外
+    if get_stream_rotation(stream):
+        return None
+
+    display_width, display_height = stream.get('width', 0), stream.get('height', 0)
+    coded_width = parse_int(stream.get('coded_width'))
+    coded_height = parse_int(stream.get('coded_height'))
+    # 符号化サイズが分からなければ正しいクロップ情報を計算できないので再エンコードに任せる
+    if coded_width < display_width or coded_height < display_height or not coded_width or not coded_height:
+        return None
+    # 切り抜き範囲は表示範囲内に限る（符号化の詰め物の行・列を含めない）
+    if x + width > display_width or y + height > display_height:
+        return None
+
+    crop_right = coded_width - x - width
+    crop_bottom = coded_height - y - height
+    # 左上はマクロブロック境界、右下は色差の間引き単位（2ピクセル）に揃っている場合のみ
+    if x % BITSTREAM_CROP_ALIGN or y % BITSTREAM_CROP_ALIGN:
+        return None
+    if crop_right % BITSTREAM_CROP_UNIT or crop_bottom % BITSTREAM_CROP_UNIT:
+        return None
+
+    return [
+        '-c', 'copy',
+        '-bsf:v', f'{bsf}=crop_left={x}:crop_right={crop_right}:crop_top={y}:crop_bottom={crop_bottom}',
+    ]
+
+
+# NVENCのエンコード設定の既定値
+#   codec: h264 / hevc
+#   preset: p1（最速）〜 p7（最高画質）
+#   tune: hq / ll / ull / lossless
+#   rc: vbr（cqで品質指定） / cbr（bitrateで固定） / constqp（cqを固定QPとして使用）
+#   multipass: disabled / qres / fullres
+DEFAULT_ENCODE_OPTS = {
+    'codec': 'h264',
+    'preset': 'p4',
+    'tune': 'hq',
+    'rc': 'vbr',
+    'cq': 23,  # 品質（0-51、低いほど高品質）
+    'bitrate': '8M',
+    'multipass': 'qres',
+}
+
+# 用途別のNVENC設定（DEFAULT_ENCODE_OPTSとの差分）
+NVENC_PROFILES = {
+    'balanced': {'preset': 'p4', 'tune': 'hq', 'multipass': 'qres'},  # 既定
+    'quality': {'preset': 'p7', 'tune': 'hq', 'multipass': 'fullres'},
+    'speed': {'preset': 'p1', 'tune': 'ull', 'multipass': 'disabled'},  # 一括処理の速度優先
+}
+
+# 旧プリセット名 → (p1〜p7, tune)（tuneがNoneなら指定された値を使う）
+LEGACY_NVENC_PRESETS = {
+    'default': ('p4', None),
+    'slow': ('p7', None),
+    'medium': ('p4', None),
+    'fast': ('p1', None),
+    'hp': ('p1', None),
+    'hq': ('p7', None),
+    'bd': ('p5', None),
+    'll': ('p4', 'll'),
+    'llhq': ('p7', 'll'),
+    'llhp': ('p1', 'll'),
+    'lossless': ('p4', 'lossless'),
+    'losslesshp': ('p1', 'lossless'),
+}
+
+
+def normalize_encode_opts(encode_opts: Optional[dict] = None) -> dict:
+    """エンコード設定に既定値を補い、旧プリセット名をp1〜p7に置き換える"""
+    opts = dict(DEFAULT_ENCODE_OPTS)
+    if encode_opts:
+        opts.update(encode_opts)
+
+    legacy = LEGACY_NVENC_PRESETS.get(str(opts['preset']).lower())
+    if legacy:
+        opts['preset'] = legacy[0]
+        if legacy[1]:
+            opts['tune'] = legacy[1]
+    return opts
+
+
+def scale_bitrate(bitrate: str, factor: float) -> str:
+    """'8M'のようなビットレート指定を定数倍する"""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([kKmMgG]?)', str(bitrate).strip())
+    if not match:
+        return str(bitrate)
+    value = float(match.group(1)) * factor
+    return f"{value:g}{match.group(2)}"
+
+
+def build_nvenc_args(encode_opts: Optional[dict] = None) -> List[str]:
+    """NVENC（h264_nvenc / hevc_nvenc）用のffmpeg引数を作成"""
+    opts = normalize_encode_opts(encode_opts)
+    encoder = 'hevc_nvenc' if opts['codec'] == 'hevc' else 'h264_nvenc'
+    args = [
+        '-c:v', encoder,
+        '-preset', opts['preset'],
+        '-tune', opts['tune'],
+        '-rc', opts['rc'],
+    ]
+
+    if opts['rc'] == 'cbr':
+        # 固定ビットレート（バッファはビットレートの2倍）
+        bitrate = opts['bitrate']
+        args.extend(['-b:v', bitrate, '-maxrate', bitrate, '-bufsize', scale_bitrate(bitrate, 2)])
+    elif opts['rc'] == 'constqp':
+        args.extend(['-qp', str(opts['cq'])])
+    else:
+        args.extend([
+            '-cq', str(opts['cq']),
+            '-b:v', '0',  # ビットレート上限なし（cqで品質を固定）
         ])
 
-        # プロセスを開始
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
-        )
+    args.extend(['-multipass', opts['multipass'], '-spatial_aq', '1'])
+    return args
 
-        # 進捗を監視（stderrから読み取る）
-        cancelled = False
+
+def run_ffmpeg(cmd: List[str], progress_callback=None, cancel_check=None) -> Tuple[int, bool, List[str]]:
+    """-progress pipe:1 付きのffmpegコマンドを実行して終了を待つ
+
+    Args:
+        cmd: 実行するコマンド（-progress pipe:1 を含めること）
+        progress_callback: 進捗コールバック関数 (seconds: float) -> None（出力済みの時間）
+        cancel_check: キャンセルチェック関数 () -> bool（Trueならキャンセル）
+
+    Returns:
+        (終了コード, キャンセルされたか, stderrの行リスト)
+    """
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        universal_newlines=True
+    )
+    try:
+        # stderrはエラー表示用に別スレッドで読み捨てる（パイプが詰まらないように）
         stderr_output = []
 
         def read_stderr():
-            nonlocal cancelled
             for line in process.stderr:
                 stderr_output.append(line)
 
-                # ffmpegはstderrに進捗情報を出力
-                if progress_callback and duration > 0 and 'time=' in line:
-                    try:
-                        # time=00:01:23.45 の形式から秒数を抽出
-                        time_match = re.search(r'time=(\d+):(\d+):(\d+\.\d+)', line)
-                        if time_match:
-                            hours = int(time_match.group(1))
-                            minutes = int(time_match.group(2))
-                            seconds = float(time_match.group(3))
-                            current_time = hours * 3600 + minutes * 60 + seconds
-                            percent = min(100.0, (current_time / duration) * 100.0)
-                            progress_callback(percent)
-                    except (ValueError, AttributeError):
-                        pass
-
         stderr_thread = threading.Thread(target=read_stderr, daemon=True)
         stderr_thread.start()
 
-        # キャンセルチェックをしながらプロセスの完了を待つ
-        while process.poll() is None:
-            # キャンセルチェック
+        # 進捗を監視（stdoutのkey=valueを読み取る）
+        cancelled = False
+        for line in process.stdout:
+            # ffmpegは0.5秒ごとに進捗を出力するので、その都度キャンセルをチェック
             if cancel_check and cancel_check():
                 cancelled = True
-                break
-            # 0.1秒ごとにチェック
-            time.sleep(0.1)
-
-        # キャンセルされた場合
-        if cancelled:
-            if process.poll() is None:  # まだ実行中なら
                 process.terminate()
                 try:
                     process.wait(timeout=5)
-                except:
+                except subprocess.TimeoutExpired:
                     # タイムアウトしたら強制終了
                     process.kill()
-                    process.wait()
+                break
+
+            key, _, value = line.strip().partition('=')
+            if key == 'out_time_us' and progress_callback:
+                try:
+                    progress_callback(int(value) / 1_000_000)
+                except ValueError:
+                    pass  # 開始直後は N/A が出力される
+
+        # プロセスの完了を待つ
+        process.wait()
+        stderr_thread.join(timeout=1)
+        return process.returncode, cancelled, stderr_output
+    finally:
+        # 例外時もプロセスをクリーンアップ
+        if process.poll() is None:
+            try:
+                process.terminate()
+                process.wait(timeout=5)
+            except Exception:
+                process.kill()
+
 
-            stderr_thread.join(timeout=1)
+def crop_video_with_ffmpeg(input_path: str, output_path: str, x: int, y: int, width: int, height: int,
+                           use_gpu: bool = False, progress_callback=None, cancel_check=None,
+                           encode_opts: Optional[dict] = None, lossless: bool = False) -> bool:
+    """ffmpegを使用して動画をトリミング
 
+    Args:
+        input_path: 入力動画のパス
+        output_path: 出力動画のパス
+        x, y, width, height: トリミング範囲
+        use_gpu: GPU（NVENC）エンコードを使用するか
+        progress_callback: 進捗コールバック関数 (percent: float) -> None
+        cancel_check: キャンセルチェック関数 () -> bool（Trueならキャンセル）
+        encode_opts: NVENCのエンコード設定（キーはDEFAULT_ENCODE_OPTSを参照、省略時は既定値）
+        lossless: 可能な場合は再エンコードせずにビットストリームのクロップで切り抜くか
+    """
+    try:
+        # 動画の長さを取得
+        duration = get_video_duration(input_path)
+
+        # 無劣化で切り抜ける場合はストリームをコピー（デコード・エンコードなし）
+        copy_args = None
+        if lossless:
+            info = probe_video(input_path)
+            if info:
+                copy_args = build_bitstream_crop_args(info['stream'], x, y, width, height)
+
+        def build_cmd(cuda_crop):
+            # 進捗はkey=value形式でstdoutに出力させる（stderrはエラーメッセージ用）
+            cmd = ['ffmpeg', '-nostats', '-progress', 'pipe:1']
+            if cuda_crop:
+                # デコードからクロップまでGPU上で行い、フレーム全体をCPUとの間で転送しない
+                cmd.extend(['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda'])
+            cmd.extend(['-i', input_path])
+            if copy_args:
+                cmd.extend(copy_args)
+            else:
+                crop_filter = 'crop_cuda' if cuda_crop else 'crop'
+                cmd.extend(['-vf', f'{crop_filter}={width}:{height}:{x}:{y}'])
+
+                # GPUエンコードが利用可能かつ指定されている場合
+                if use_gpu:
+                    cmd.extend(build_nvenc_args(encode_opts))
+
+                cmd.extend(['-c:a', 'copy'])  # 音声はそのままコピー
+
+            cmd.extend([
+                '-y',  # 上書き確認なし
+                output_path
+            ])
+            return cmd
+
+        # ffmpegを実行（進捗は秒で返るので割合に変換）
+        def on_progress(seconds):
+            if progress_callback and duration > 0:
+                progress_callback(min(100.0, seconds / duration * 100.0))
+
+        def run():
+            cuda_crop = use_gpu and not copy_args and check_cuda_crop_available()
+            result = run_ffmpeg(build_cmd(cuda_crop), on_progress, cancel_check)
+            returncode, cancelled, _ = result
+            if cuda_crop and returncode != 0 and not cancelled:
+                # GPUでデコードできない形式などは、CPUでのクロップでやり直す
+                print(f"GPU上でのクロップに失敗したため、CPUでクロップします: {input_path}")
+                result = run_ffmpeg(build_cmd(False), on_progress, cancel_check)
+            return result
+
+        returncode, cancelled, stderr_output = run()
+        if copy_args and returncode == 0 and not cancelled and not video_has_size(output_path, width, height):
+            # クロップ情報の書き換えで指定どおりのサイズにならなかった場合は再エンコードでやり直す
+            print(f"警告: 無劣化での切り抜き結果のサイズが一致しないため、再エンコードします: {input_path}")
+            copy_args = None
+            returncode, cancelled, stderr_output = run()
+
+        # キャンセルされた場合
+        if cancelled:
             # 不完全なファイルを削除
             if os.path.exists(output_path):
                 try:
@@ -214,18 +931,12 @@ def crop_video_with_ffmpeg(input_path: str, output_path: str, x: int, y: int, wi
                     print(f"警告: 不完全なファイルの削除に失敗しました: {output_path} - {e}")
             return False
 
-        # 正常終了を待つ
-        stderr_thread.join(timeout=1)
-        return process.returncode == 0
+        if returncode != 0:
+            print(f"エラー: ffmpegが失敗しました: {input_path}\n{''.join(stderr_output[-10:])}")
+            return False
+        return True
     except Exception as e:
         print(f"エラー: 動画のトリミング中に問題が発生しました: {e}")
-        # エラー時もプロセスをクリーンアップ
-        if process and process.poll() is None:
-            try:
-                process.terminate()
-                process.wait(timeout=5)
-            except:
-                pass
         # 不完全なファイルを削除
         if output_path and os.path.exists(output_path):
             try:
@@ -235,18 +946,163 @@ def crop_video_with_ffmpeg(input_path: str, output_path: str, x: int, y: int, wi
         return False
 
 
+def concat_group_key(info: dict) -> tuple:
+    """concat demuxerで1つにつなげられる動画かを判定するキー（一致する動画同士をまとめる）"""
+    stream = info['stream']
+    audio = info.get('audio_stream') or {}
+    return (
+        stream.get('codec_name'), stream.get('width'), stream.get('height'),
+        stream.get('pix_fmt'), stream.get('r_frame_rate'), get_stream_rotation(stream),
+        audio.get('codec_name'), audio.get('sample_rate'), audio.get('channels'),
+    )
+
+
+def concat_video_duration(info: dict) -> float:
+    """concatでつなげても分割位置がずれない動画なら映像ストリームの長さ（秒）を返す（そうでなければ0）
+
+    分割位置は映像の長さから決めるため、コンテナと映像ストリームの長さが異なるもの
+    （音声の方が長いなど）や、開始時刻が0でないものは、フレームが隣のファイルに
+    はみ出すので対象外にする。許容する差は半フレーム分。
+    """
+    stream = info['stream']
+    try:
+        video_duration = float(stream.get('duration', 0.0))
+        video_start = float(stream.get('start_time', 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+    tolerance = 0.5 / info['fps'] if info['fps'] > 0 else 0.001
+    if video_duration <= 0:
+        return 0.0
+    if abs(video_start) > tolerance or abs(info['start_time']) > tolerance:
+        return 0.0
+    if abs(video_duration - info['duration']) > tolerance:
+        return 0.0
+    return video_duration
+
+
+def quote_concat_path(path: str) -> str:
+    """concat demuxerのリストファイル用にパスをクォート"""
+    return "'" + os.path.abspath(path).replace("'", "'\\''") + "'"
+
+
+def crop_videos_concat_with_ffmpeg(input_paths: List[str], output_paths: List[str],
+                                   x: int, y: int, width: int, height: int,
+                                   use_gpu: bool = False, progress_callback=None, cancel_check=None,
+                                   encode_opts: Optional[dict] = None) -> List[bool]:
+    """同じ形式の複数の動画を1回のffmpegでトリミング（concat demuxer + segment muxer）
+
+    エンコーダーの初期化を1回で済ませるため、入力をつなげてエンコードし、
+    元の動画の境界で強制キーフレームを打って分割し直す。
+    入力はconcat_group_keyが一致し、concat_video_durationが0でないものに限る。
+
+    Args:
+        input_paths: 入力動画のパスのリスト
+        output_paths: 出力動画のパスのリスト（input_pathsと同じ順・同じ拡張子）
+        x, y, width, height: トリミング範囲
+        use_gpu: GPU（NVENC）エンコードを使用するか
+        progress_callback: 進捗コールバック関数 (index: int, percent: float) -> None
+        cancel_check: キャンセルチェック関数 () -> bool（Trueならキャンセル）
+        encode_opts: NVENCのエンコード設定（キーはDEFAULT_ENCODE_OPTSを参照、省略時は既定値）
+
+    Returns:
+        ファイルごとの成否のリスト
+    """
+    results = [False] * len(input_paths)
+    # 分割位置は映像ストリームの長さから決める（コンテナの長さは音声などを含むことがある）
+    infos = [probe_video(path) for path in input_paths]
+    durations = [concat_video_duration(info) if info else 0.0 for info in infos]
+    if not all(duration > 0 for duration in durations):
+        print(f"エラー: 分割位置を決められない動画が含まれています: {', '.join(input_paths)}")
+        return results
+    # 各ファイルの開始時刻（つなげた動画上の位置）
+    starts = list(itertools.accumulate(durations, initial=0.0))
+    boundaries = ','.join(f'{t:.6f}' for t in starts[1:-1])
+    ext = os.path.splitext(output_paths[0])[1]
+
+    work_dir = tempfile.mkdtemp(prefix='.batch_crop_', dir=os.path.dirname(output_paths[0]))
+    try:
+        list_path = os.path.join(work_dir, 'inputs.txt')
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for path in input_paths:
+                f.write(f"file {quote_concat_path(path)}\n")
+
+        cmd = ['ffmpeg', '-nostats', '-progress', 'pipe:1',
+               '-f', 'concat', '-safe', '0', '-i', list_path,
+               '-vf', f'crop={width}:{height}:{x}:{y}']
+        if use_gpu:
+            cmd.extend(build_nvenc_args(encode_opts))
+            cmd.extend(['-forced-idr', '1'])  # 強制キーフレームをIDRにして分割点にする
+        cmd.extend([
+            '-force_key_frames', boundaries,
+            '-c:a', 'copy',  # 音声はそのままコピー
+            '-f', 'segment',
+            '-segment_times', boundaries,
+            '-reset_timestamps', '1',
+            '-y',
+            os.path.join(work_dir, f'segment_%d{ext}')
+        ])
+
+        # つなげた動画上の時刻から、どのファイルを処理中かを求めて進捗を通知
+        def on_progress(seconds):
+            if not progress_callback:
+                return
+            for i, duration in enumerate(durations):
+                if seconds < starts[i + 1] or i == len(durations) - 1:
+                    progress_callback(i, min(100.0, max(0.0, seconds - starts[i]) / duration * 100.0))
+                    return
+
+        returncode, cancelled, stderr_output = run_ffmpeg(cmd, on_progress, cancel_check)
+        if cancelled:
+            return results
+        if returncode != 0:
+            print(f"エラー: ffmpegが失敗しました: {', '.join(input_paths)}\n{''.join(stderr_output[-10:])}")
+            return results
+
+        # 分割されたファイルを確保済みの保存先へ移動
+        for i, output_path in enumerate(output_paths):
+            segment_path = os.path.join(work_dir, f'segment_{i}{ext}')
+            if os.path.exists(segment_path):
+                os.replace(segment_path, output_path)
+                results[i] = True
+            else:
+                print(f"エラー: 分割後のファイルがありません: {input_paths[i]}")
+        return results
+    except Exception as e:
+        print(f"エラー: 動画のトリミング中に問題が発生しました: {e}")
+        return results
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def default_video_concurrency(use_gpu: bool) -> int:
+    """同時に実行するffmpegプロセス数の既定値"""
+    if use_gpu:
+        return 2  # NVENCエンジンは1チップに1〜2基
+    # libx264は1プロセスで複数コアを使うため、コア数の1/4程度に抑える
+    return max(1, (os.cpu_count() or 1) // 4)
+
+
 class VideoProcessorThread(QThread):
     """動画処理を別スレッドで実行するクラス"""
     progress_updated = Signal(int, float)  # (file_index, percent)
     file_completed = Signal(int, bool)  # (file_index, success)
     all_completed = Signal(int)  # (saved_count)
 
-    def __init__(self, files_to_process, crop_rect, output_folder, use_gpu=False):
+    def __init__(self, files_to_process, crop_rect, output_folder, use_gpu=False,
+                 encode_opts=None, lossless=False,
+                 concurrency=None, concat_batches=False):
         super().__init__()
         self.files_to_process = files_to_process
         self.crop_rect = crop_rect
         self.output_folder = output_folder
         self.use_gpu = use_gpu
+        # NVENCの設定（画面の「設定」でNVENC_PROFILESから選んだ値を含む）
+        self.encode_opts = normalize_encode_opts(encode_opts)
+        self.lossless = lossless  # 可能な場合は再エンコードなしで切り抜く
+        # 同時に実行するffmpegプロセス数
+        self.concurrency = concurrency or default_video_concurrency(use_gpu)
+        # 同じ形式の動画を1回のffmpegでまとめて処理するか
+        self.concat_batches = concat_batches
         self._is_cancelled = False
 
     def cancel(self):
@@ -254,107 +1110,466 @@ class VideoProcessorThread(QThread):
         self._is_cancelled = True
 
     def run(self):
-        """スレッドのメイン処理"""
+        """スレッドのメイン処理（複数のffmpegプロセスを並列に実行）"""
         saved_count = 0
+        max_workers = max(1, min(self.concurrency, len(self.files_to_process)))
 
-        for i, file_path in enumerate(self.files_to_process):
-            if self._is_cancelled:
-                break
+        singles, batches = self.group_files()
 
-            filename = os.path.basename(file_path)
-            name, ext = os.path.splitext(filename)
-            save_path = os.path.join(self.output_folder, f"{name}_cropped{ext}")
-
-            # 既存ファイルがあれば連番を付ける
-            counter = 1
-            while os.path.exists(save_path):
-                save_path = os.path.join(self.output_folder, f"{name}_cropped_{counter}{ext}")
-                counter += 1
-
-            # 進捗コールバック
-            def progress_callback(percent):
-                if not self._is_cancelled:
-                    self.progress_updated.emit(i, percent)
-
-            # キャンセルチェック
-            def cancel_check():
-                return self._is_cancelled
-
-            # 動画をトリミング
-            success = crop_video_with_ffmpeg(
-                file_path, save_path,
-                self.crop_rect.x(), self.crop_rect.y(),
-                self.crop_rect.width(), self.crop_rect.height(),
-                use_gpu=self.use_gpu,
-                progress_callback=progress_callback,
-                cancel_check=cancel_check
-            )
-
-            if success:
-                saved_count += 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # {future: 処理するファイルの番号のリスト}
+            futures = {executor.submit(self.process_file, i): [i] for i in singles}
+            futures.update({executor.submit(self.process_batch, indices): indices for indices in batches})
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except OSError as e:
+                    # 保存先を作成できない（書き込めないフォルダ・容量不足など）場合は失敗として扱い、
+                    # スレッドを止めずに残りのファイルの処理と完了通知を続ける
+                    print(f"エラー: 保存先のファイルを作成できません: {e}")
+                    results = [(i, False) for i in futures[future]]
+                for i, success in results:
+                    if success:
+                        saved_count += 1
 
-            self.file_completed.emit(i, success)
+                    self.file_completed.emit(i, success)
 
         self.all_completed.emit(saved_count)
 
+    def group_files(self) -> Tuple[List[int], List[List[int]]]:
+        """1ファイルずつ処理するものと、まとめて処理できるグループに分ける"""
+        indices = range(len(self.files_to_process))
+        if not self.concat_batches:
+            return list(indices), []
+
+        rect = self.crop_rect
+        singles = []
+        groups = {}
+        for i in indices:
+            file_path = self.files_to_process[i]
+            info = probe_video(file_path)
+            # 分割位置がずれるおそれのある動画（長さが不明・開始時刻が0でない・音声の方が長いなど）や、
+            # 無劣化で切り抜ける動画は個別に処理
+            if (not info or concat_video_duration(info) <= 0 or
+                    (self.lossless and build_bitstream_crop_args(
+                        info['stream'], rect.x(), rect.y(), rect.width(), rect.height()))):
+                singles.append(i)
+                continue
+            key = (get_extension(file_path), concat_group_key(info))
+            groups.setdefault(key, []).append(i)
+
+        batches = []
+        for group in groups.values():
+            if len(group) > 1:
+                batches.append(group)
+            else:
+                singles.extend(group)
+        return sorted(singles), batches
+
+    def process_file(self, i: int) -> List[Tuple[int, bool]]:
+        """1ファイルを切り抜いて保存（ワーカースレッドで実行される）"""
+        if self._is_cancelled:
+            return [(i, False)]
+
+        file_path = self.files_to_process[i]
+        filename = os.path.basename(file_path)
+        name, ext = os.path.splitext(filename)
+        # 既存ファイルがあれば連番を付ける（並列実行でも名前が衝突しない）
+        save_path = claim_unique_save_path(self.output_folder, name, ext)
+
+        # 進捗コールバック
+        def progress_callback(percent):
+            if not self._is_cancelled:
+                self.progress_updated.emit(i, percent)
+
+        # キャンセルチェック（実行中のffmpegはそれぞれここで終了される）
+        def cancel_check():
+            return self._is_cancelled
+
+        # 動画をトリミング
+        success = crop_video_with_ffmpeg(
+            file_path, save_path,
+            self.crop_rect.x(), self.crop_rect.y(),
+            self.crop_rect.width(), self.crop_rect.height(),
+            use_gpu=self.use_gpu,
+            progress_callback=progress_callback,
+            cancel_check=cancel_check,
+            encode_opts=self.encode_opts,
+            lossless=self.lossless
+        )
+
+        if not success:
+            # 確保した保存先（空ファイルや不完全なファイル）を削除
+            remove_file_quietly(save_path)
+        return [(i, success)]
+
+    def process_batch(self, indices: List[int]) -> List[Tuple[int, bool]]:
+        """同じ形式の複数ファイルを1回のffmpegで切り抜いて保存（ワーカースレッドで実行される）"""
+        if self._is_cancelled:
+            return [(i, False) for i in indices]
+
+        input_paths = [self.files_to_process[i] for i in indices]
+        save_paths = []
+        try:
+            for file_path in input_paths:
+                name, ext = os.path.splitext(os.path.basename(file_path))
+                save_paths.append(claim_unique_save_path(self.output_folder, name, ext))
+        except OSError:
+            # 途中まで確保した保存先（空ファイル）を残さない
+            for save_path in save_paths:
+                remove_file_quietly(save_path)
+            raise
+
+        def progress_callback(n, percent):
+            if not self._is_cancelled:
+                self.progress_updated.emit(indices[n], percent)
+
+        def cancel_check():
+            return self._is_cancelled
+
+        results = crop_videos_concat_with_ffmpeg(
+            input_paths, save_paths,
+            self.crop_rect.x(), self.crop_rect.y(),
+            self.crop_rect.width(), self.crop_rect.height(),
+            use_gpu=self.use_gpu,
+            progress_callback=progress_callback,
+            cancel_check=cancel_check,
+            encode_opts=self.encode_opts
+        )
+
+        for save_path, success in zip(save_paths, results):
+            if not success:
+                remove_file_quietly(save_path)
+        return list(zip(indices, results))
+
+
+class ImageLoadSignals(QObject):
+    """ImageLoadTaskの完了通知用シグナル（QRunnableはシグナルを持てないため）"""
+    finished = Signal(str, QImage)  # (image_path, image)
 
-class FileListItemWidget(QWidget):
-    """ファイルリストのカスタムアイテムウィジェット（2行表示）"""
-    def __init__(self, filename: str, size_text: str, file_type: str):
+
+class ImageLoadTask(QRunnable):
+    """画像ファイル（動画の場合は最初のフレーム）をワーカースレッドでQImageにするタスク
+
+    QPixmapはメインスレッドでしか扱えないため、ここではQImageまでを作成し、
+    QPixmapへの変換は完了通知を受けたメインスレッド側で行う。
+    """
+    def __init__(self, image_path: str):
         super().__init__()
-        layout = QVBoxLayout()
-        layout.setContentsMargins(5, 3, 5, 3)
-        layout.setSpacing(2)
+        self.image_path = image_path
+        self.signals = ImageLoadSignals()
 
-        # 1行目: アイコン + ファイル名
-        name_layout = QHBoxLayout()
-        name_layout.setContentsMargins(0, 0, 0, 0)
+    def run(self):
+        if is_video_file(self.image_path):
+            # 抽出したフレームはQImage自身がデータを持つので、そのままシグナルで渡せる
+            image = extract_first_frame(self.image_path) or QImage()
+        else:
+            image = QImage(self.image_path)
+        self.signals.finished.emit(self.image_path, image)
 
-        type_icon = "🎬" if file_type == 'video' else "🖼️"
-        self.name_label = QLabel(f"{type_icon} {filename}")
-        self.name_label.setStyleSheet("font-weight: normal; font-size: 11px;")
-        name_layout.addWidget(self.name_label)
-        name_layout.addStretch()
 
-        layout.addLayout(name_layout)
+# 追加時に取得したファイル情報をキャッシュする数（同じファイルを追加し直した時に取得し直さない）
+METADATA_CACHE_SIZE = 512
 
-        # 2行目: サイズ情報
-        self.size_label = QLabel(f"  {size_text}")
-        self.size_label.setStyleSheet("color: #888; font-size: 10px;")
-        layout.addWidget(self.size_label)
-
-        self.setLayout(layout)
-        self.normal_color = "#000"
-        self.disabled_color = "#999"
-
-    def set_enabled_style(self, enabled: bool):
-        """有効/無効スタイルを設定"""
-        if enabled:
-            self.name_label.setStyleSheet("font-weight: normal; font-size: 11px; color: #000;")
-            self.size_label.setStyleSheet("font-size: 10px; color: #888;")
+
+@functools.lru_cache(maxsize=METADATA_CACHE_SIZE)
+def probe_media(file_path: str, mtime: float, size_bytes: int) -> tuple:
+    """ファイルの種類とサイズを取得（更新日時とバイト数もキーに含め、変更されたファイルは取得し直す）
+
+    戻り値は (file_type, (width, height), ImageMeta or None)。
+    取得できない場合はValueError（例外はキャッシュされないので、コピー中だったファイルも次回は取得し直す）。
+    """
+    if is_video_file(file_path):
+        size = get_video_info(file_path)
+        if not size:
+            raise ValueError(f"動画のサイズを取得できません: {file_path}")
+        return 'video', size, None
+    # ヘッダーのみ読み込み、サイズと形式を保存時のために記録
+    meta = probe_image(file_path)
+    if not meta:
+        raise ValueError(f"画像のサイズを取得できません: {file_path}")
+    return 'image', (meta.width, meta.height), meta
+
+
+def metadata_thread_count() -> int:
+    """ファイル情報取得の並列数（ffprobeの終了待ちやヘッダー読み込みの待ち時間が主なのでコア数より多くする）"""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+class MetadataSignals(QObject):
+    """MetadataTaskの完了通知用シグナル"""
+    finished = Signal(str, str, object, object)  # (file_path, file_type, (width, height) or None, ImageMeta or None)
+
+
+class MetadataTask(QRunnable):
+    """追加されたファイルのサイズ（画像はヘッダー、動画はffprobe）をワーカースレッドで取得するタスク"""
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = MetadataSignals()
+
+    def run(self):
+        try:
+            stat = os.stat(self.file_path)
+            file_type, size, meta = probe_media(self.file_path, stat.st_mtime, stat.st_size)
+        except (OSError, ValueError):
+            self.signals.finished.emit(self.file_path, '', None, None)
+            return
+        self.signals.finished.emit(self.file_path, file_type, size, meta)
+
+
+# 取得したファイル情報をリストへ反映する間隔（ミリ秒）
+METADATA_FLUSH_INTERVAL_MS = 50
+
+# 動画処理の進捗表示を更新する最短間隔（ミリ秒、約30Hz）
+PROGRESS_UPDATE_INTERVAL_MS = 33
+
+# 異なるサイズのファイルを追加した時のステータスバー表示時間（ミリ秒）
+MIXED_SIZE_MESSAGE_MS = 10000
+
+
+# ファイルリストの独自ロール（UserRoleはファイルパス）
+SIZE_TEXT_ROLE = int(Qt.ItemDataRole.UserRole) + 1
+FILE_TYPE_ROLE = int(Qt.ItemDataRole.UserRole) + 2
+TARGET_ROLE = int(Qt.ItemDataRole.UserRole) + 3  # 選択中のファイルと同じサイズ（処理対象）ならTrue
+
+# ファイルリストに表示する種類ごとのアイコン
+FILE_TYPE_ICONS = {'video': "🎬", 'image': "🖼️"}
+
+
+class FileListModel(QAbstractListModel):
+    """ファイルリストのモデル（行ごとの値を項目ごとのリストに持ち、行ごとのウィジェットを作らない）"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.paths: List[str] = []
+        self.filenames: List[str] = []
+        self.types: List[str] = []  # 'image' or 'video'
+        self.sizes: List[Tuple[int, int]] = []
+        self.target_size = None  # 選択中のファイルのサイズ（未選択ならNone）
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.filenames[row]
+        if role == Qt.ItemDataRole.UserRole:
+            return self.paths[row]
+        if role == SIZE_TEXT_ROLE:
+            # 文字列は描画する行の分だけ作る
+            width, height = self.sizes[row]
+            return f"{width} × {height}"
+        if role == FILE_TYPE_ROLE:
+            return self.types[row]
+        if role == TARGET_ROLE:
+            return self.target_size is None or self.sizes[row] == self.target_size
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.tooltip(row)
+        return None
+
+    def tooltip(self, row: int) -> str:
+        """行のツールチップ（表示する時にだけ組み立てる）"""
+        width, height = self.sizes[row]
+        if self.target_size is None:
+            type_label = "動画" if self.types[row] == 'video' else "画像"
+            return f"{type_label}\nサイズ: {width}x{height}"
+        if self.sizes[row] == self.target_size:
+            # 処理対象
+            return f"サイズ: {width}x{height}\n✓ このファイルは切り抜き処理されます"
+        # スキップ対象
+        return f"サイズ: {width}x{height}\n✗ サイズが異なるためスキップされます"
+
+    def append_files(self, entries: List[Tuple[str, Tuple[int, int], str]]):
+        """ファイルをまとめて末尾に追加（entriesは (path, (width, height), file_type) のリスト）
+
+        行の追加はビューへ1回だけ通知する。
+        """
+        if not entries:
+            return
+        first = len(self.paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        for path, size, file_type in entries:
+            self.paths.append(path)
+            # os.path.basenameより軽い末尾の切り出し（Windowsでは'/'と'\\'のどちらの区切りもある）
+            self.filenames.append(path[max(path.rfind('/'), path.rfind(os.sep)) + 1:])
+            self.types.append(file_type)
+            self.sizes.append(size)
+        self.endInsertRows()
+
+    def remove_rows(self, rows):
+        """指定した行をまとめて削除
+
+        後ろの行から削除して前の行の番号をずらさず、連続する行は1回の通知でまとめて削除する。
+        """
+        rows = sorted(set(rows), reverse=True)
+        i = 0
+        while i < len(rows):
+            last = first = rows[i]
+            i += 1
+            while i < len(rows) and rows[i] == first - 1:
+                first = rows[i]
+                i += 1
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for values in (self.paths, self.filenames, self.types, self.sizes):
+                del values[first:last + 1]
+            self.endRemoveRows()
+
+    def clear(self):
+        """すべての行を削除"""
+        self.beginResetModel()
+        for values in (self.paths, self.filenames, self.types, self.sizes):
+            values.clear()
+        self.target_size = None
+        self.endResetModel()
+
+    def set_target_size(self, size: Optional[Tuple[int, int]]):
+        """処理対象のサイズを設定（表示は描画時に決まるので、処理対象かどうかが変わった行だけを通知する）"""
+        previous = self.target_size
+        if size == previous:
+            return
+        self.target_size = size
+        changed = [row for row, row_size in enumerate(self.sizes)
+                   if (previous is None or row_size == previous) != (size is None or row_size == size)]
+        if changed:
+            self.dataChanged.emit(self.index(changed[0]), self.index(changed[-1]))
+
+
+class FileListDelegate(QStyledItemDelegate):
+    """ファイルリストの行を描画するデリゲート（2行表示。ウィジェットを使わずQPainterで直接描く）"""
+    MARGIN_X = 5
+    MARGIN_Y = 3
+    LINE_SPACING = 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont(parent.font()) if parent is not None else QFont()
+        self.name_font.setPixelSize(11)
+        self.size_font = QFont(self.name_font)
+        self.size_font.setPixelSize(10)
+        self.name_metrics = QFontMetrics(self.name_font)
+        self.name_height = self.name_metrics.height()
+        self.size_height = QFontMetrics(self.size_font).height()
+        # 処理対象かどうかで色を変える {処理対象: 色}
+        self.name_colors = {True: QColor("#000"), False: QColor("#999")}
+        self.size_colors = {True: QColor("#888"), False: QColor("#bbb")}
+        # 行の高さはどの行も同じなので一度だけ計算する
+        self.row_size = QSize(0, self.MARGIN_Y * 2 + self.name_height + self.LINE_SPACING + self.size_height)
+        # 描画済みの種類アイコン {(種類, 色, デバイスピクセル比): QPixmap}
+        self.type_pixmaps = {}
+
+    def type_pixmap(self, file_type: str, color: QColor, device_pixel_ratio: float) -> QPixmap:
+        """種類アイコンのピックスマップを取得（絵文字の描画は初回の一度だけ）"""
+        key = (file_type, color.rgba(), device_pixel_ratio)
+        pixmap = self.type_pixmaps.get(key)
+        if pixmap is None:
+            text = FILE_TYPE_ICONS.get(file_type, FILE_TYPE_ICONS['image'])
+            width = self.name_metrics.horizontalAdvance(text)
+            pixmap = QPixmap(round_half_away(width * device_pixel_ratio),
+                             round_half_away(self.name_height * device_pixel_ratio))
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setFont(self.name_font)
+            painter.setPen(color)
+            painter.drawText(QRect(0, 0, width, self.name_height),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+            painter.end()
+            self.type_pixmaps[key] = pixmap
+        return pixmap
+
+    def sizeHint(self, option, index):
+        return self.row_size
+
+    def paint(self, painter, option, index):
+        # 選択・ホバーの背景はスタイルに任せ、文字だけを描く
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, widget)
+
+        enabled = bool(index.data(TARGET_ROLE))
+        if option.state & QStyle.StateFlag.State_Selected:
+            name_color = size_color = option.palette.highlightedText().color()
         else:
-            self.name_label.setStyleSheet("font-weight: normal; font-size: 11px; color: #999;")
-            self.size_label.setStyleSheet("font-size: 10px; color: #bbb;")
+            name_color = self.name_colors[enabled]
+            size_color = self.size_colors[enabled]
+
+        rect = option.rect.adjusted(self.MARGIN_X, self.MARGIN_Y, -self.MARGIN_X, -self.MARGIN_Y)
+        name_rect = QRect(rect.left(), rect.top(), rect.width(), self.name_height)
+        size_rect = QRect(rect.left(), name_rect.bottom() + 1 + self.LINE_SPACING, rect.width(), self.size_height)
+        align = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+        painter.save()
+        # 1行目: アイコン + ファイル名（入りきらない場合は中央を省略）
+        icon = self.type_pixmap(index.data(FILE_TYPE_ROLE), name_color, painter.device().devicePixelRatioF())
+        painter.drawPixmap(name_rect.topLeft(), icon)
+        name_rect.setLeft(name_rect.left() + round_half_away(icon.width() / icon.devicePixelRatio()))
+        name = self.name_metrics.elidedText(f" {index.data()}", Qt.TextElideMode.ElideMiddle, name_rect.width())
+        painter.setFont(self.name_font)
+        painter.setPen(name_color)
+        painter.drawText(name_rect, align, name)
+        # 2行目: サイズ情報
+        painter.setFont(self.size_font)
+        painter.setPen(size_color)
+        painter.drawText(size_rect, align, f"  {index.data(SIZE_TEXT_ROLE)}")
+        painter.restore()
+
+
+def round_half_away(value: float) -> int:
+    """四捨五入して整数にする（0.5は0から遠い方へ。round()の偶数丸めより速い）"""
+    return int(value + 0.5) if value >= 0 else int(value - 0.5)
 
 
-class ImageViewer(QLabel):
+# ImageViewerのミップマップの段数（原寸, 1/2, 1/4, 1/8）
+MIP_LEVEL_COUNT = 4
+
+# QPixmapCacheの上限（KB）。ミップマップを数枚分保持できるように既定の10MBから増やす
+PIXMAP_CACHE_LIMIT_KB = 256 * 1024
+
+# ImageViewerが保持するデコード済み画像の数（選択中の前後を先読みする分）
+IMAGE_CACHE_SIZE = 8
+
+# ハンドル名（角→辺の順、判定が同距離の場合は先のものを優先）
+HANDLE_NAMES = ('resize_tl', 'resize_tr', 'resize_bl', 'resize_br',
+                'resize_t', 'resize_b', 'resize_l', 'resize_r')
+
+# ハンドルごとのリサイズ計算 (ドラッグ開始時の矩形, dx, dy) -> (left, top, right, bottom)
+# ドラッグしたハンドルに対応する辺だけを移動量分動かす
+RESIZE_OPS = {
+    'resize_tl': lambda r, dx, dy: (r.left() + dx, r.top() + dy, r.right(), r.bottom()),
+    'resize_tr': lambda r, dx, dy: (r.left(), r.top() + dy, r.right() + dx, r.bottom()),
+    'resize_bl': lambda r, dx, dy: (r.left() + dx, r.top(), r.right(), r.bottom() + dy),
+    'resize_br': lambda r, dx, dy: (r.left(), r.top(), r.right() + dx, r.bottom() + dy),
+    'resize_t': lambda r, dx, dy: (r.left(), r.top() + dy, r.right(), r.bottom()),
+    'resize_b': lambda r, dx, dy: (r.left(), r.top(), r.right(), r.bottom() + dy),
+    'resize_l': lambda r, dx, dy: (r.left() + dx, r.top(), r.right(), r.bottom()),
+    'resize_r': lambda r, dx, dy: (r.left(), r.top(), r.right() + dx, r.bottom()),
+}
+
+
+class ImageViewer(QWidget):
+    """画像と切り抜き範囲を表示するビューア（ズーム・パンは描画時の座標変換で行う）"""
     cropChanged = Signal(QRect)
     cropChanging = Signal(QRect)  # リアルタイム更新用のシグナル
     zoomChanged = Signal(float)  # ズーム率変更通知
 
     def __init__(self):
         super().__init__()
-        self.setScaledContents(False)
-        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.setStyleSheet("QLabel { background-color: #f0f0f0; border: 1px solid #ccc; }")
         self.setMouseTracking(True)
+        # 背景はpaintEventで全面を塗るので、Qtによる消去は不要
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), PIXMAP_CACHE_LIMIT_KB))
 
         self.original_pixmap = None
-        self.display_pixmap = None
+        # 縮小表示用のミップマップ [(倍率, QPixmap), ...]（倍率の大きい順、先頭は原寸）
+        self.mip_levels = []
+        self.display_size = QSize()  # 現在のズーム率での画像の表示サイズ
         self.scale_factor = 1.0
         self.min_scale_factor = 0.1
         self.max_scale_factor = 10.0
-        self.pan_offset = QPointF(0, 0)
+        self.pan_offset = QPointF(0, 0)  # 中央からの画像の移動量（ウィジェット座標）
         self.crop_rect = QRect()
         self.is_selecting = False
         self.selection_start = QPoint()
@@ -365,38 +1580,161 @@ class ImageViewer(QLabel):
         self.drag_start_pos = QPoint()
         self.drag_start_rect = QRect()
         self.handle_size = 8
+        # 元画像の右端・下端のピクセル座標（width-1, height-1）
+        self.image_max_x = 0
+        self.image_max_y = 0
+        # ハンドル中心座標のキャッシュ（表示上の切り抜き矩形ごと）
+        self.handle_pts = np.zeros((8, 2), dtype=np.int32)
+        self.handle_pts_key = None
 
         # パン用の変数（右クリックドラッグ）
         self.is_panning = False
         self.pan_start_pos = QPoint()
-        self.scroll_start_x = 0
-        self.scroll_start_y = 0
+        self.pan_start_offset = QPointF(0, 0)
 
         # アスペクト比固定
         self.aspect_ratio_locked = False
         self.aspect_ratio = 1.0  # width / height
-        
+
+        # バックグラウンドで読み込み中の画像パス（古い読み込み結果を破棄するため）
+        self.pending_image_path = None
+        # デコード済み画像のLRUキャッシュ {path: QImage}（メインスレッドでのみ操作）
+        self.image_cache = OrderedDict()
+        self.loading_paths = set()  # ワーカースレッドでデコード中のパス
+
+        # 最後に描画した切り抜き矩形（ウィジェット座標、部分再描画の範囲計算用）
+        self.painted_crop_rect = QRect()
+
+        # ドラッグ中の再描画と通知を画面の更新間隔（約60Hz）にまとめるタイマー
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(16)
+        self.update_timer.timeout.connect(self.flush_crop_update)
+
+        # ホイールイベントの間引き用（前回ズームしてからの経過時間と溜まった回転量）
+        self.wheel_clock = QElapsedTimer()
+        self.pending_wheel_delta = 0
+        self.pending_wheel_pos = QPointF()
+        self.wheel_flush_timer = QTimer(self)
+        self.wheel_flush_timer.setSingleShot(True)
+        self.wheel_flush_timer.setInterval(16)
+        self.wheel_flush_timer.timeout.connect(self.apply_pending_zoom)
+
+        # set_crop_rectによる再描画をまとめるタイマー（イベントループに戻った時に実行）
+        self.repaint_timer = QTimer(self)
+        self.repaint_timer.setSingleShot(True)
+        self.repaint_timer.setInterval(0)
+        self.repaint_timer.timeout.connect(self.update_crop_region)
+
+        # リサイズ中は何度もフィットし直さず、最後の1回だけにまとめるタイマー
+        self.fit_timer = QTimer(self)
+        self.fit_timer.setSingleShot(True)
+        self.fit_timer.setInterval(100)
+        self.fit_timer.timeout.connect(self.refit_after_resize)
+
+        # ホイールでのズームが止まってから滑らかな補間で描き直すタイマー
+        self.fast_render = False
+        self.smooth_timer = QTimer(self)
+        self.smooth_timer.setSingleShot(True)
+        self.smooth_timer.setInterval(80)
+        self.smooth_timer.timeout.connect(self.apply_smooth_render)
+
+    def apply_smooth_render(self):
+        """ズーム操作の終了後、滑らかな補間で描き直す"""
+        self.fast_render = False
+        self.update()
+
+    def refit_after_resize(self):
+        """リサイズ後に画像をウィンドウに合わせる（手動でズームした場合はそのまま）"""
+        if not self.user_zoomed and not self.display_size.isEmpty():
+            self.fit_to_window()
+
+    def schedule_crop_update(self):
+        """再描画と cropChanging の通知を予約（予約済みなら何もしない）"""
+        if not self.update_timer.isActive():
+            self.update_timer.start()
+
+    def flush_crop_update(self):
+        """予約された再描画と通知を最新の crop_rect で実行"""
+        self.update_timer.stop()
+        self.update_crop_region()
+        self.cropChanging.emit(self.crop_rect)  # リアルタイム通知
+
+    def update_crop_region(self):
+        """前回描いた切り抜き矩形と新しい矩形を囲む範囲だけを再描画（線とハンドルの分だけ広げる）
+
+        描画前に何度変更されても、最後に描画した矩形と現在の矩形だけを囲めばよい。
+        """
+        self.repaint_timer.stop()
+        new_rect = self.get_view_transform().mapRect(QRectF(self.crop_rect)).toRect()
+        if self.painted_crop_rect.isEmpty() or new_rect.isEmpty():
+            self.update()
+        else:
+            margin = self.handle_size + 4
+            self.update(self.painted_crop_rect.united(new_rect).adjusted(-margin, -margin, margin, margin))
+
     def set_image(self, image_path: str):
-        self.original_pixmap = QPixmap(image_path)
-        if self.original_pixmap.isNull():
+        """画像を表示（先読み済みならすぐに表示し、なければワーカースレッドでデコード）"""
+        image = self.image_cache.get(image_path)
+        if image is not None:
+            self.image_cache.move_to_end(image_path)
+            self.set_qimage(image)
+            return
+
+        self.pending_image_path = image_path
+        self.preload_image(image_path)
+
+    def preload_image(self, image_path: str):
+        """画像のデコードをワーカースレッドで開始（キャッシュ済み・読み込み中なら何もしない）"""
+        if image_path in self.image_cache or image_path in self.loading_paths:
+            return
+        self.loading_paths.add(image_path)
+        task = ImageLoadTask(image_path)
+        task.signals.finished.connect(self.on_image_loaded)
+        QThreadPool.globalInstance().start(task)
+
+    def clear_image_cache(self):
+        """先読みした画像を破棄"""
+        self.image_cache.clear()
+
+    def on_image_loaded(self, image_path: str, image: QImage):
+        """ワーカースレッドでのデコード完了時（メインスレッドで呼ばれる）"""
+        self.loading_paths.discard(image_path)
+        if not image.isNull():
+            # 古い順に捨てるLRUキャッシュ
+            self.image_cache[image_path] = image
+            self.image_cache.move_to_end(image_path)
+            while len(self.image_cache) > IMAGE_CACHE_SIZE:
+                self.image_cache.popitem(last=False)
+
+        # 読み込み中に別のファイルが選択された場合（先読みの場合も）は表示しない
+        if image_path != self.pending_image_path:
+            return
+        self.set_qimage(image)
+
+    def set_qimage(self, image: QImage):
+        """デコード済みのQImageを表示する"""
+        self.pending_image_path = None
+        if image is None or image.isNull():
             return False
 
+        # QPixmap.fromImageはメインスレッドでの変換のみ（デコード済みなので高速）
+        self.original_pixmap = QPixmap.fromImage(image)
+        # ドラッグ時の境界判定用に右端・下端のピクセル座標を保持
+        self.image_max_x = self.original_pixmap.width() - 1
+        self.image_max_y = self.original_pixmap.height() - 1
+        self.build_mip_levels(image.cacheKey())
         self.user_zoomed = False  # 新しい画像をロードしたらフラグをリセット
+        self.pan_offset = QPointF(0, 0)  # 画像を中央に表示
         self.fit_to_window()
-        # スクロール位置を画像中央に設定（レイアウト更新後に実行）
-        QTimer.singleShot(0, self.center_image)
         return True
     
     def fit_to_window(self):
         if not self.original_pixmap:
             return
 
-        # スクロールエリア内にいるため、親（viewport）のサイズを取得
-        # 親がない場合は、デフォルトサイズ（800x600）を使用
-        if self.parent():
-            widget_size = self.parent().size()
-        else:
-            widget_size = QSize(800, 600)
+        # ビューア自身が表示領域の大きさ
+        widget_size = self.size()
 
         pixmap_size = self.original_pixmap.size()
 
@@ -404,34 +1742,65 @@ class ImageViewer(QLabel):
         scale_h = widget_size.height() / pixmap_size.height()
         self.scale_factor = min(scale_w, scale_h, 1.0) * 0.95
 
-        scaled_size = pixmap_size * self.scale_factor
-
-        # 倍率に応じてスケーリング方式を切り替え
-        # 100%以上：FastTransformation（ピクセル境界くっきり）
-        # 100%未満：SmoothTransformation（滑らかに縮小）
-        transform_mode = Qt.TransformationMode.FastTransformation if self.scale_factor >= 1.0 else Qt.TransformationMode.SmoothTransformation
-
-        self.display_pixmap = self.original_pixmap.scaled(
-            scaled_size,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            transform_mode
-        )
-
         self.update_display()
         self.zoomChanged.emit(self.scale_factor)
     
+    def build_mip_levels(self, image_key: Optional[int] = None):
+        """1/2ずつ縮小したミップマップを作成（ズームのたびに原寸から縮小し直さないため）
+
+        image_key（元のQImageのcacheKey）を指定すると、縮小結果をQPixmapCacheに保存し、
+        先読みキャッシュから同じ画像を再表示した時に縮小し直さずに済ませる。
+        """
+        self.mip_levels = [(1.0, self.original_pixmap)]
+        level_scale = 1.0
+        pixmap = self.original_pixmap
+        while len(self.mip_levels) < MIP_LEVEL_COUNT and min(pixmap.width(), pixmap.height()) >= 32:
+            level_scale /= 2
+            cache_key = f"mip|{image_key}|{len(self.mip_levels)}" if image_key is not None else None
+            cached = QPixmapCache.find(cache_key) if cache_key else None
+            if cached is not None and not cached.isNull():
+                pixmap = cached
+            else:
+                pixmap = pixmap.scaled(
+                    pixmap.size() / 2,
+                    Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
+                if cache_key:
+                    QPixmapCache.insert(cache_key, pixmap)
+            self.mip_levels.append((level_scale, pixmap))
+
+    def get_mip_level(self) -> QPixmap:
+        """現在のズーム率で描画に使うミップマップを取得
+
+        表示サイズ以上の大きさを持つ最小のレベルを使う（拡大して描くとぼやけるため）。
+        高DPI画面では論理ピクセルあたりの物理ピクセル数を考慮する。
+        """
+        device_scale = self.scale_factor * self.devicePixelRatioF()
+        pixmap = self.original_pixmap
+        for level_scale, level_pixmap in self.mip_levels:
+            if level_scale < device_scale:
+                break
+            pixmap = level_pixmap
+        return pixmap
+
     def update_display(self):
-        if not self.display_pixmap:
-            self.setPixmap(QPixmap())  # 空のPixmapを設定
+        # 現在のズーム率での表示サイズ（描画時にミップマップから縮小して描く）
+        if self.original_pixmap:
+            self.display_size = QSize(
+                round(self.original_pixmap.width() * self.scale_factor),
+                round(self.original_pixmap.height() * self.scale_factor)
+            )
+        else:
+            self.display_size = QSize()
+
+        if self.display_size.isEmpty():
             self.setMinimumSize(400, 300)  # 最小サイズを設定
+            self.update()  # 背景だけを描画
             return
 
-        # 画像サイズの3倍のキャンバスを作成（上下左右に画像サイズ分の余白）
-        # これにより、画像を自由に移動できる
-        widget_width = self.display_pixmap.width() * 3
-        widget_height = self.display_pixmap.height() * 3
-
-        self.setFixedSize(widget_width, widget_height)
+        # ズームで画像サイズが変わるので移動量を範囲内に収め直す
+        self.clamp_pan_offset()
 
         # 再描画して矩形を表示
         self.update()
@@ -439,50 +1808,61 @@ class ImageViewer(QLabel):
     def paintEvent(self, event):
         """画像と矩形を描画"""
         # 親クラスのpaintEventは呼ばない（自分で描画する）
-
-        if not self.display_pixmap:
-            return
-
+        # WA_OpaquePaintEventで背景の消去を省いているので、全ピクセルをここで描く
         painter = QPainter(self)
+        # 再描画が必要な領域だけに描画を制限
+        painter.setClipRegion(event.region())
 
-        # 画像を中央に描画（3倍キャンバスの中央）
-        label_rect = self.rect()
-        x_offset = (label_rect.width() - self.display_pixmap.width()) // 2
-        y_offset = (label_rect.height() - self.display_pixmap.height()) // 2
-
-        painter.drawPixmap(x_offset, y_offset, self.display_pixmap)
+        # 背景と枠線（表示領域の大きさのウィジェットに描画する）
+        painter.fillRect(self.rect(), QColor(0xf0, 0xf0, 0xf0))
+        painter.setPen(QColor(0xcc, 0xcc, 0xcc))
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
 
-        if self.crop_rect.isEmpty():
+        self.painted_crop_rect = QRect()
+        if self.display_size.isEmpty():
             painter.end()
             return
 
-        # 切り抜き矩形をスケール変換
-        scaled_rect = QRect(
-            round(self.crop_rect.x() * self.scale_factor),
-            round(self.crop_rect.y() * self.scale_factor),
-            round(self.crop_rect.width() * self.scale_factor),
-            round(self.crop_rect.height() * self.scale_factor)
+        # 画像を中央（＋パンの移動量）に描画
+        offset = self.get_image_offset()
+        x_offset = offset.x()
+        y_offset = offset.y()
+
+        # 倍率に応じて描画方式を切り替え
+        # 100%以上：原寸をそのまま拡大（ピクセル境界くっきり）
+        # 100%未満：ミップマップから滑らかに縮小
+        # ホイールでのズーム中は補間を省いて高速に描画
+        if self.scale_factor < 1.0 and not self.fast_render:
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        pixmap = self.get_mip_level()
+        painter.drawPixmap(
+            QRectF(x_offset, y_offset, self.display_size.width(), self.display_size.height()),
+            pixmap,
+            QRectF(pixmap.rect())
         )
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
 
-        # オフセットを適用
-        scaled_rect.translate(x_offset, y_offset)
+        if self.crop_rect.isEmpty():
+            painter.end()
+            return
 
-        # 画像の範囲
-        image_rect = QRect(x_offset, y_offset, self.display_pixmap.width(), self.display_pixmap.height())
+        # 元画像の座標系 → ウィジェット座標系の変換（座標計算はQt側で行う）
+        transform = self.get_view_transform()
 
         # 暗いオーバーレイ（画像内の切り抜き範囲外のみ）
-        # 上部
-        if scaled_rect.top() > image_rect.top():
-            painter.fillRect(image_rect.left(), image_rect.top(), image_rect.width(), scaled_rect.top() - image_rect.top(), QBrush(QColor(0, 0, 0, 100)))
-        # 下部
-        if scaled_rect.bottom() < image_rect.bottom():
-            painter.fillRect(image_rect.left(), scaled_rect.bottom(), image_rect.width(), image_rect.bottom() - scaled_rect.bottom(), QBrush(QColor(0, 0, 0, 100)))
-        # 左部
-        if scaled_rect.left() > image_rect.left():
-            painter.fillRect(image_rect.left(), scaled_rect.top(), scaled_rect.left() - image_rect.left(), scaled_rect.height(), QBrush(QColor(0, 0, 0, 100)))
-        # 右部
-        if scaled_rect.right() < image_rect.right():
-            painter.fillRect(scaled_rect.right(), scaled_rect.top(), image_rect.right() - scaled_rect.right(), scaled_rect.height(), QBrush(QColor(0, 0, 0, 100)))
+        # 画像全体と切り抜き範囲を偶奇ルールで塗りつぶし、範囲外だけを1回で描画
+        overlay = QPainterPath()
+        overlay.setFillRule(Qt.FillRule.OddEvenFill)
+        overlay.addRect(QRectF(self.original_pixmap.rect()))
+        overlay.addRect(QRectF(self.crop_rect))
+        painter.save()
+        painter.setTransform(transform)
+        painter.fillPath(overlay, QColor(0, 0, 0, 100))
+        painter.restore()
+
+        # 線とハンドルは拡大率によらず一定の太さで描くため、ウィジェット座標系で描画
+        scaled_rect = transform.mapRect(QRectF(self.crop_rect)).toRect()
+        self.painted_crop_rect = scaled_rect
 
         # 外側の赤い実線（切り取り線の外側を示す）
         pen_outer = QPen(QColor(255, 0, 0), 2, Qt.PenStyle.SolidLine)
@@ -496,37 +1876,68 @@ class ImageViewer(QLabel):
         inner_rect = scaled_rect.adjusted(1, 1, -1, -1)
         painter.drawRect(inner_rect)
 
-        # ハンドル（調整用の四角）を描画
-        painter.fillRect(scaled_rect.x() - self.handle_size//2, scaled_rect.y() - self.handle_size//2,
-                       self.handle_size, self.handle_size, QColor(255, 0, 0))
-        painter.fillRect(scaled_rect.right() - self.handle_size//2, scaled_rect.y() - self.handle_size//2,
-                       self.handle_size, self.handle_size, QColor(255, 0, 0))
-        painter.fillRect(scaled_rect.x() - self.handle_size//2, scaled_rect.bottom() - self.handle_size//2,
-                       self.handle_size, self.handle_size, QColor(255, 0, 0))
-        painter.fillRect(scaled_rect.right() - self.handle_size//2, scaled_rect.bottom() - self.handle_size//2,
-                       self.handle_size, self.handle_size, QColor(255, 0, 0))
-
-        # 辺の中央のハンドル
-        painter.fillRect(scaled_rect.center().x() - self.handle_size//2, scaled_rect.y() - self.handle_size//2,
-                       self.handle_size, self.handle_size, QColor(255, 0, 0))
-        painter.fillRect(scaled_rect.center().x() - self.handle_size//2, scaled_rect.bottom() - self.handle_size//2,
-                       self.handle_size, self.handle_size, QColor(255, 0, 0))
-        painter.fillRect(scaled_rect.x() - self.handle_size//2, scaled_rect.center().y() - self.handle_size//2,
-                       self.handle_size, self.handle_size, QColor(255, 0, 0))
-        painter.fillRect(scaled_rect.right() - self.handle_size//2, scaled_rect.center().y() - self.handle_size//2,
-                       self.handle_size, self.handle_size, QColor(255, 0, 0))
+        # ハンドル（調整用の四角）を描画：角4つと辺の中央4つ
+        half = self.handle_size // 2
+        center = scaled_rect.center()
+        handle_points = (
+            (scaled_rect.x(), scaled_rect.y()), (scaled_rect.right(), scaled_rect.y()),
+            (scaled_rect.x(), scaled_rect.bottom()), (scaled_rect.right(), scaled_rect.bottom()),
+            (center.x(), scaled_rect.y()), (center.x(), scaled_rect.bottom()),
+            (scaled_rect.x(), center.y()), (scaled_rect.right(), center.y()),
+        )
+        handle_color = QColor(255, 0, 0)
+        for handle_x, handle_y in handle_points:
+            painter.fillRect(handle_x - half, handle_y - half, self.handle_size, self.handle_size, handle_color)
 
         painter.end()
     
+    def get_view_transform(self) -> QTransform:
+        """元画像の座標系からウィジェット座標系への変換"""
+        offset = self.get_image_offset()
+        transform = QTransform()
+        transform.translate(offset.x(), offset.y())
+        transform.scale(self.scale_factor, self.scale_factor)
+        return transform
+
     def get_image_offset(self):
         """画像の描画オフセットを取得"""
-        if not self.display_pixmap:
+        if self.display_size.isEmpty():
             return QPoint(0, 0)
         label_rect = self.rect()
-        x_offset = (label_rect.width() - self.display_pixmap.width()) // 2
-        y_offset = (label_rect.height() - self.display_pixmap.height()) // 2
+        x_offset = (label_rect.width() - self.display_size.width()) // 2 + round(self.pan_offset.x())
+        y_offset = (label_rect.height() - self.display_size.height()) // 2 + round(self.pan_offset.y())
         return QPoint(x_offset, y_offset)
 
+    def clamp_pan_offset(self):
+        """画像が表示領域から離れすぎないように移動量を制限
+
+        上下左右に画像1枚分まではみ出せる（以前の3倍キャンバスと同じ可動範囲）。
+        """
+        if self.display_size.isEmpty():
+            self.pan_offset = QPointF(0, 0)
+            return
+        limit_x = max(0.0, (self.display_size.width() * 3 - self.width()) / 2)
+        limit_y = max(0.0, (self.display_size.height() * 3 - self.height()) / 2)
+        self.pan_offset = QPointF(
+            max(-limit_x, min(self.pan_offset.x(), limit_x)),
+            max(-limit_y, min(self.pan_offset.y(), limit_y))
+        )
+
+    def get_handle_points(self, scaled_rect: QRect) -> np.ndarray:
+        """ハンドルの中心座標の配列 (8, 2) を取得（表示上の矩形が変わった時だけ再計算）"""
+        key = (scaled_rect.x(), scaled_rect.y(), scaled_rect.width(), scaled_rect.height())
+        if key != self.handle_pts_key:
+            left, top = scaled_rect.x(), scaled_rect.y()
+            right, bottom = scaled_rect.right(), scaled_rect.bottom()
+            cx, cy = scaled_rect.center().x(), scaled_rect.center().y()
+            # HANDLE_NAMESと同じ順
+            self.handle_pts = np.array([
+                (left, top), (right, top), (left, bottom), (right, bottom),
+                (cx, top), (cx, bottom), (left, cy), (right, cy),
+            ], dtype=np.int32)
+            self.handle_pts_key = key
+        return self.handle_pts
+
     def get_handle_at_pos(self, pos):
         """マウス位置にあるハンドルを判定"""
         if self.crop_rect.isEmpty():
@@ -543,25 +1954,12 @@ class ImageViewer(QLabel):
 
         tolerance = self.handle_size + 2
 
-        # 角のハンドル
-        if abs(pos.x() - scaled_rect.x()) < tolerance and abs(pos.y() - scaled_rect.y()) < tolerance:
-            return 'resize_tl'
-        if abs(pos.x() - scaled_rect.right()) < tolerance and abs(pos.y() - scaled_rect.y()) < tolerance:
-            return 'resize_tr'
-        if abs(pos.x() - scaled_rect.x()) < tolerance and abs(pos.y() - scaled_rect.bottom()) < tolerance:
-            return 'resize_bl'
-        if abs(pos.x() - scaled_rect.right()) < tolerance and abs(pos.y() - scaled_rect.bottom()) < tolerance:
-            return 'resize_br'
-
-        # 辺のハンドル
-        if abs(pos.x() - scaled_rect.center().x()) < tolerance and abs(pos.y() - scaled_rect.y()) < tolerance:
-            return 'resize_t'
-        if abs(pos.x() - scaled_rect.center().x()) < tolerance and abs(pos.y() - scaled_rect.bottom()) < tolerance:
-            return 'resize_b'
-        if abs(pos.x() - scaled_rect.x()) < tolerance and abs(pos.y() - scaled_rect.center().y()) < tolerance:
-            return 'resize_l'
-        if abs(pos.x() - scaled_rect.right()) < tolerance and abs(pos.y() - scaled_rect.center().y()) < tolerance:
-            return 'resize_r'
+        # 全ハンドルとの距離（チェビシェフ距離）をまとめて計算し、最も近いものを判定
+        handle_pts = self.get_handle_points(scaled_rect)
+        distances = np.maximum(np.abs(handle_pts[:, 0] - pos.x()), np.abs(handle_pts[:, 1] - pos.y()))
+        nearest = int(np.argmin(distances))  # 同じ距離なら角のハンドルを優先
+        if distances[nearest] < tolerance:
+            return HANDLE_NAMES[nearest]
 
         # 矩形内部（移動）
         if scaled_rect.contains(pos):
@@ -574,22 +1972,17 @@ class ImageViewer(QLabel):
         if event.button() == Qt.MouseButton.RightButton:
             self.is_panning = True
             self.pan_start_pos = event.globalPosition().toPoint()
-
-            # スクロールエリアの現在のスクロール位置を保存
-            scroll_area = self.get_scroll_area()
-            if scroll_area:
-                self.scroll_start_x = scroll_area.horizontalScrollBar().value()
-                self.scroll_start_y = scroll_area.verticalScrollBar().value()
+            self.pan_start_offset = QPointF(self.pan_offset)
 
             self.setCursor(Qt.CursorShape.ClosedHandCursor)
             return
 
-        if event.button() == Qt.MouseButton.LeftButton and self.display_pixmap:
+        if event.button() == Qt.MouseButton.LeftButton and not self.display_size.isEmpty():
             offset = self.get_image_offset()
             click_pos = event.position().toPoint() - offset
 
             # 画像の範囲内をクリックしたか確認
-            image_rect = QRect(0, 0, self.display_pixmap.width(), self.display_pixmap.height())
+            image_rect = QRect(0, 0, self.display_size.width(), self.display_size.height())
             if image_rect.contains(click_pos):
                 handle = self.get_handle_at_pos(event.position().toPoint())
 
@@ -604,7 +1997,7 @@ class ImageViewer(QLabel):
                     self.crop_rect = QRect(self.selection_start, QSize())
     
     def mouseMoveEvent(self, event):
-        if not self.display_pixmap:
+        if self.display_size.isEmpty():
             return
 
         # パン（スクロール）中の処理
@@ -612,11 +2005,10 @@ class ImageViewer(QLabel):
             current_pos = event.globalPosition().toPoint()
             delta = current_pos - self.pan_start_pos
 
-            # スクロールエリアのスクロール位置を更新（ドラッグの逆方向）
-            scroll_area = self.get_scroll_area()
-            if scroll_area:
-                scroll_area.horizontalScrollBar().setValue(self.scroll_start_x - delta.x())
-                scroll_area.verticalScrollBar().setValue(self.scroll_start_y - delta.y())
+            # 画像をドラッグした方向に移動
+            self.pan_offset = self.pan_start_offset + QPointF(delta)
+            self.clamp_pan_offset()
+            self.update()
             return
 
         offset = self.get_image_offset()
@@ -626,7 +2018,7 @@ class ImageViewer(QLabel):
         current_pos = current_pos_float.toPoint()
 
         # 画像の範囲
-        image_rect = QRect(0, 0, self.display_pixmap.width(), self.display_pixmap.height())
+        image_rect = QRect(0, 0, self.display_size.width(), self.display_size.height())
 
         # カーソル変更
         if not self.is_selecting and not self.drag_mode:
@@ -687,21 +2079,20 @@ class ImageViewer(QLabel):
                 scaled_rect = QRect(x, y, width, height)
 
             # 元画像の座標系に変換（範囲チェック付き）
-            crop_x = round(scaled_rect.x() / self.scale_factor)
-            crop_y = round(scaled_rect.y() / self.scale_factor)
-            crop_w = round(scaled_rect.width() / self.scale_factor)
-            crop_h = round(scaled_rect.height() / self.scale_factor)
+            crop_x = round_half_away(scaled_rect.x() / self.scale_factor)
+            crop_y = round_half_away(scaled_rect.y() / self.scale_factor)
+            crop_w = round_half_away(scaled_rect.width() / self.scale_factor)
+            crop_h = round_half_away(scaled_rect.height() / self.scale_factor)
 
             # 元画像の範囲内に収める
-            crop_x = max(0, min(crop_x, self.original_pixmap.width() - 1))
-            crop_y = max(0, min(crop_y, self.original_pixmap.height() - 1))
-            crop_w = min(crop_w, self.original_pixmap.width() - crop_x)
-            crop_h = min(crop_h, self.original_pixmap.height() - crop_y)
+            crop_x = max(0, min(crop_x, self.image_max_x))
+            crop_y = max(0, min(crop_y, self.image_max_y))
+            crop_w = min(crop_w, self.image_max_x + 1 - crop_x)
+            crop_h = min(crop_h, self.image_max_y + 1 - crop_y)
 
             self.crop_rect = QRect(crop_x, crop_y, crop_w, crop_h)
 
-            self.update()  # Pixmapコピーなしで再描画
-            self.cropChanging.emit(self.crop_rect)  # リアルタイム通知
+            self.schedule_crop_update()  # 再描画と通知は1フレームに1回にまとめる
 
         # ドラッグ中（移動・リサイズ）
         elif self.drag_mode:
@@ -721,92 +2112,56 @@ class ImageViewer(QLabel):
 
             if self.drag_mode == 'move':
                 # 矩形全体を移動
-                new_x = round(self.drag_start_rect.x() + delta_unscaled.x())
-                new_y = round(self.drag_start_rect.y() + delta_unscaled.y())
+                new_x = round_half_away(self.drag_start_rect.x() + delta_unscaled.x())
+                new_y = round_half_away(self.drag_start_rect.y() + delta_unscaled.y())
 
                 # 画像境界内に制限
-                new_x = max(0, min(new_x, self.original_pixmap.width() - self.drag_start_rect.width()))
-                new_y = max(0, min(new_y, self.original_pixmap.height() - self.drag_start_rect.height()))
+                new_x = max(0, min(new_x, self.image_max_x + 1 - self.drag_start_rect.width()))
+                new_y = max(0, min(new_y, self.image_max_y + 1 - self.drag_start_rect.height()))
 
                 if new_x != self.crop_rect.x() or new_y != self.crop_rect.y():
                     self.crop_rect = QRect(new_x, new_y, self.drag_start_rect.width(), self.drag_start_rect.height())
-                    self.update()  # Pixmapコピーなしで再描画
-                    self.cropChanging.emit(self.crop_rect)  # リアルタイム通知
+                    self.schedule_crop_update()  # 再描画と通知は1フレームに1回にまとめる
 
             else:
                 # リサイズ処理 - 浮動小数点精度を維持
-                # 新しい座標を計算（浮動小数点）
-                left = float(self.drag_start_rect.left())
-                top = float(self.drag_start_rect.top())
-                right = float(self.drag_start_rect.right())
-                bottom = float(self.drag_start_rect.bottom())
-
                 # アスペクト比固定時は辺のハンドルでのリサイズを無効化
                 if self.aspect_ratio_locked and self.drag_mode in ['resize_t', 'resize_b', 'resize_l', 'resize_r']:
                     return
 
-                # 各ハンドルに応じて適切な辺だけを変更
-                if self.drag_mode == 'resize_tl':
-                    left = self.drag_start_rect.left() + delta_unscaled.x()
-                    top = self.drag_start_rect.top() + delta_unscaled.y()
-                    # アスペクト比固定
-                    if self.aspect_ratio_locked:
-                        width = right - left
-                        height = width / self.aspect_ratio
-                        top = bottom - height
-                elif self.drag_mode == 'resize_tr':
-                    right = self.drag_start_rect.right() + delta_unscaled.x()
-                    top = self.drag_start_rect.top() + delta_unscaled.y()
-                    # アスペクト比固定
-                    if self.aspect_ratio_locked:
-                        width = right - left
-                        height = width / self.aspect_ratio
+                # ハンドルに応じて動かす辺だけを変更した新しい座標（浮動小数点）
+                resize_op = RESIZE_OPS.get(self.drag_mode)
+                if resize_op is None:
+                    return
+                left, top, right, bottom = resize_op(self.drag_start_rect, delta_unscaled.x(), delta_unscaled.y())
+
+                # アスペクト比固定（角のハンドルのみ）：幅から高さを決め、反対側の辺を固定する
+                if self.aspect_ratio_locked:
+                    height = (right - left) / self.aspect_ratio
+                    if self.drag_mode in ('resize_tl', 'resize_tr'):
                         top = bottom - height
-                elif self.drag_mode == 'resize_bl':
-                    left = self.drag_start_rect.left() + delta_unscaled.x()
-                    bottom = self.drag_start_rect.bottom() + delta_unscaled.y()
-                    # アスペクト比固定
-                    if self.aspect_ratio_locked:
-                        width = right - left
-                        height = width / self.aspect_ratio
-                        bottom = top + height
-                elif self.drag_mode == 'resize_br':
-                    right = self.drag_start_rect.right() + delta_unscaled.x()
-                    bottom = self.drag_start_rect.bottom() + delta_unscaled.y()
-                    # アスペクト比固定
-                    if self.aspect_ratio_locked:
-                        width = right - left
-                        height = width / self.aspect_ratio
+                    else:
                         bottom = top + height
-                elif self.drag_mode == 'resize_t':
-                    top = self.drag_start_rect.top() + delta_unscaled.y()
-                elif self.drag_mode == 'resize_b':
-                    bottom = self.drag_start_rect.bottom() + delta_unscaled.y()
-                elif self.drag_mode == 'resize_l':
-                    left = self.drag_start_rect.left() + delta_unscaled.x()
-                elif self.drag_mode == 'resize_r':
-                    right = self.drag_start_rect.right() + delta_unscaled.x()
 
                 # 最後に整数に丸める
-                left = round(left)
-                top = round(top)
-                right = round(right)
-                bottom = round(bottom)
+                left = round_half_away(left)
+                top = round_half_away(top)
+                right = round_half_away(right)
+                bottom = round_half_away(bottom)
 
                 # 矩形が反転しないように制限（最小サイズ10ピクセル）
                 # QRect.right() = x + width - 1 なので、width = right - left + 1
                 if right - left + 1 > 10 and bottom - top + 1 > 10:
-                    # 画像境界内に制限
+                    # 画像境界内に制限（右端・下端は画像の読み込み時に計算済み）
                     left = max(0, left)
                     top = max(0, top)
-                    right = min(self.original_pixmap.width() - 1, right)
-                    bottom = min(self.original_pixmap.height() - 1, bottom)
+                    right = min(self.image_max_x, right)
+                    bottom = min(self.image_max_y, bottom)
 
-                    new_rect = QRect(int(left), int(top), int(right - left + 1), int(bottom - top + 1))
+                    new_rect = QRect(left, top, right - left + 1, bottom - top + 1)
                     if new_rect != self.crop_rect:
                         self.crop_rect = new_rect
-                        self.update()  # Pixmapコピーなしで再描画
-                        self.cropChanging.emit(self.crop_rect)  # リアルタイム通知
+                        self.schedule_crop_update()  # 再描画と通知は1フレームに1回にまとめる
     
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.RightButton:
@@ -818,6 +2173,9 @@ class ImageViewer(QLabel):
             self.is_selecting = False
             self.drag_mode = None
             self.setCursor(Qt.CursorShape.ArrowCursor)
+            # 予約中の更新があれば確定前に反映
+            if self.update_timer.isActive():
+                self.flush_crop_update()
             if not self.crop_rect.isEmpty():
                 self.cropChanged.emit(self.crop_rect)
 
@@ -826,28 +2184,34 @@ class ImageViewer(QLabel):
         if not self.original_pixmap:
             return
 
-        # スクロールエリアを取得
-        scroll_area = self.get_scroll_area()
-        if not scroll_area:
+        # タッチパッドなどで1フレームより短い間隔で届いたイベントは回転量を溜めてまとめて適用
+        self.pending_wheel_delta += event.angleDelta().y()
+        self.pending_wheel_pos = event.position()
+        if self.wheel_clock.isValid() and self.wheel_clock.elapsed() < 12:
+            # 続くイベントが来なくても溜めた分が反映されるように予約
+            if not self.wheel_flush_timer.isActive():
+                self.wheel_flush_timer.start()
+            return
+        self.apply_pending_zoom()
+
+    def apply_pending_zoom(self):
+        """溜まっているホイールの回転量でズーム（最後のマウス位置を中心に）"""
+        self.wheel_flush_timer.stop()
+        self.wheel_clock.restart()
+        zoom_delta = self.pending_wheel_delta / 120.0
+        self.pending_wheel_delta = 0
+        if not self.original_pixmap or zoom_delta == 0:
             return
 
         # ズーム前のマウス位置（ImageViewer座標系）
-        mouse_pos_widget = event.position()
+        mouse_pos_widget = self.pending_wheel_pos
 
-        # 画像のオフセットを取得
-        offset = self.get_image_offset()
-
-        # マウスが画像上の位置（スケール済み画像での座標）
-        mouse_on_image_x = mouse_pos_widget.x() - offset.x()
-        mouse_on_image_y = mouse_pos_widget.y() - offset.y()
-
-        # 元画像のピクセル座標
-        image_x = mouse_on_image_x / self.scale_factor
-        image_y = mouse_on_image_y / self.scale_factor
+        # マウス位置が指す元画像のピクセル座標（描画に使う変換の逆変換で求める）
+        inverse, _ = self.get_view_transform().inverted()
+        image_point = inverse.map(mouse_pos_widget)
 
         # ズーム倍率の変更
         old_scale = self.scale_factor
-        zoom_delta = event.angleDelta().y() / 120.0
         zoom_factor = 1.1 ** zoom_delta
 
         new_scale = old_scale * zoom_factor
@@ -859,118 +2223,79 @@ class ImageViewer(QLabel):
         self.user_zoomed = True
         self.scale_factor = new_scale
 
-        # 新しいスケールで画像をスケーリング
-        pixmap_size = self.original_pixmap.size()
-        scaled_size = pixmap_size * self.scale_factor
-
-        # 倍率に応じてスケーリング方式を切り替え
-        # 100%以上：FastTransformation（ピクセル境界くっきり）
-        # 100%未満：SmoothTransformation（滑らかに縮小）
-        transform_mode = Qt.TransformationMode.FastTransformation if self.scale_factor >= 1.0 else Qt.TransformationMode.SmoothTransformation
-
-        self.display_pixmap = self.original_pixmap.scaled(
-            scaled_size,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            transform_mode
-        )
+        # ホイール操作が続いている間は高速な補間で描画し、止まってから滑らかに描き直す
+        self.fast_render = True
+        self.smooth_timer.start()
 
         self.update_display()
         self.zoomChanged.emit(self.scale_factor)
 
-        # マウス位置が同じ画像座標を指すようにスクロール位置を調整
-        # viewport内でのマウス位置（グローバル座標から変換）
-        viewport = scroll_area.viewport()
-        global_mouse_pos = self.mapToGlobal(mouse_pos_widget.toPoint())
-        viewport_mouse_pos = viewport.mapFromGlobal(global_mouse_pos)
-
-        # 新しいスケールでの画像上の位置
-        new_mouse_on_image_x = image_x * self.scale_factor
-        new_mouse_on_image_y = image_y * self.scale_factor
-
-        # 新しいオフセット（3倍キャンバスの中央）
-        new_offset = self.get_image_offset()
-
-        # マウスがviewport内の同じ位置にいるために必要なスクロール位置
-        # ImageViewer座標 = スクロール位置 + viewport内の位置
-        # スクロール位置 = ImageViewer座標 - viewport内の位置
-        new_scroll_x = (new_mouse_on_image_x + new_offset.x()) - viewport_mouse_pos.x()
-        new_scroll_y = (new_mouse_on_image_y + new_offset.y()) - viewport_mouse_pos.y()
-
-        # スクロールバーの範囲内に制限
-        h_bar = scroll_area.horizontalScrollBar()
-        v_bar = scroll_area.verticalScrollBar()
-
-        new_scroll_x = max(h_bar.minimum(), min(int(new_scroll_x), h_bar.maximum()))
-        new_scroll_y = max(v_bar.minimum(), min(int(new_scroll_y), v_bar.maximum()))
-
-        h_bar.setValue(new_scroll_x)
-        v_bar.setValue(new_scroll_y)
+        # マウス位置が同じ画像座標を指すように移動量を調整
+        # 移動量 = マウス位置 - 新しいズーム率で中央に置いた場合のその画像座標の位置
+        centered = QTransform()
+        centered.translate((self.width() - self.display_size.width()) // 2,
+                           (self.height() - self.display_size.height()) // 2)
+        centered.scale(self.scale_factor, self.scale_factor)
+        self.pan_offset = mouse_pos_widget - centered.map(image_point)
+        self.clamp_pan_offset()
+        self.update()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        # スクロールエリア内にいるため、resizeEventでの自動調整は無効化
-        # 画像読み込み時のみfit_to_window()を呼ぶ
+        self.clamp_pan_offset()
+        # 手動でズームしていなければ、リサイズが落ち着いてからウィンドウに合わせ直す
+        if not self.user_zoomed:
+            self.fit_timer.start()
     
     def get_crop_rect(self) -> QRect:
         return self.crop_rect
 
     def set_crop_rect(self, rect: QRect):
-        self.crop_rect = rect
-        self.update()  # Pixmapコピーなしで再描画
+        # 同じ矩形なら再描画しない（アスペクト比の切り替え時などに頻発する）
+        if rect == self.crop_rect:
+            return
+        self.crop_rect = QRect(rect)
+        # スピンボックスの連続入力などで続けて呼ばれても、再描画はイベントループ1周に1回にまとめる
+        if not self.repaint_timer.isActive():
+            self.repaint_timer.start()
 
     def set_aspect_ratio(self, locked: bool, ratio: float = 1.0):
         """アスペクト比を設定"""
         self.aspect_ratio_locked = locked
         self.aspect_ratio = ratio
 
-    def get_scroll_area(self):
-        """親のQScrollAreaを取得"""
-        parent = self.parent()
-        if parent:
-            # parentはviewportなので、その親がQScrollArea
-            scroll_area = parent.parent()
-            if isinstance(scroll_area, QScrollArea):
-                return scroll_area
-        return None
-
-    def center_image(self):
-        """スクロール位置を調整して画像を中央に表示"""
-        if not self.display_pixmap:
-            return
-
-        scroll_area = self.get_scroll_area()
-        if not scroll_area:
-            return
-
-        # 3倍キャンバスの中央に画像が描画されているので、
-        # スクロール位置を画像の中央に合わせる
-        # 画像の中央位置（ウィジェット座標系）
-        # 3倍キャンバスの中央 = 画像サイズ * 3 / 2
-        image_center_x = self.display_pixmap.width() * 3 // 2
-        image_center_y = self.display_pixmap.height() * 3 // 2
-
-        # viewportのサイズ
-        viewport = scroll_area.viewport()
-        viewport_width = viewport.width()
-        viewport_height = viewport.height()
-
-        # 画像の中央がviewportの中央に来るようなスクロール位置
-        scroll_x = image_center_x - viewport_width // 2
-        scroll_y = image_center_y - viewport_height // 2
 
-        # スクロールバーに設定
-        scroll_area.horizontalScrollBar().setValue(scroll_x)
-        scroll_area.verticalScrollBar().setValue(scroll_y)
+# 標準アイコンのキャッシュ（QApplication作成後に初回アクセスで生成）
+_STANDARD_ICONS = {}
 
 
 class BatchImageCropper(QMainWindow):
     def __init__(self):
         super().__init__()
         self.image_files: List[str] = []
-        self.image_sizes = {}  # {file_path: (width, height)}
-        self.file_types = {}  # {file_path: 'image' or 'video'}
+        self.image_files_set = set()  # 追加済みかどうかの判定用（image_filesは順番を保つためのリスト）
+        self.file_meta = {}  # {file_path: FileMeta}（サイズ・種類をまとめて1回の検索で取り出す）
+        # サイズごとのファイル {(width, height): {file_path: None}}（追加順を保ち、削除もO(1)）
+        # 同じサイズのファイルを全件走査せずに取り出すため
+        self.size_buckets = defaultdict(dict)
         self.current_index = -1
         self.crop_rect = QRect()
+        # 最後にスピンボックスの範囲を計算した時の (画像幅, 画像高さ, x, y, 幅, 高さ)
+        self.last_spin_key = None
+        # サイズ取得中のファイル {file_path: (file_type, size, meta) or None（取得待ち）}（追加した順）
+        self.pending_files = OrderedDict()
+        # 取得中のファイルも含めた、今回の追加で見つかったサイズ {(width, height): [file_path, ...]}
+        self.pending_size_groups = {}
+        # サイズ取得用のスレッドプール（プレビューの読み込みを待たせないよう共有プールとは分ける）
+        self.metadata_pool = QThreadPool(self)
+        self.metadata_pool.setMaxThreadCount(metadata_thread_count())
+        # 取得結果はまとめてリストへ反映する
+        self.metadata_flush_timer = QTimer(self)
+        self.metadata_flush_timer.setSingleShot(True)
+        self.metadata_flush_timer.setInterval(METADATA_FLUSH_INTERVAL_MS)
+        self.metadata_flush_timer.timeout.connect(self.flush_pending_files)
+        # 動画処理の進捗表示を最後に更新してからの経過時間
+        self.progress_clock = QElapsedTimer()
 
         self.setup_ui()
         self.setAcceptDrops(True)  # ドラッグ&ドロップを有効化
@@ -983,6 +2308,14 @@ class BatchImageCropper(QMainWindow):
                 "ffmpegが見つかりません。\n動画のトリミング機能を使用するには、ffmpegをインストールしてください。\n\n画像のトリミングは通常通り使用できます。"
             )
     
+    def standard_icon(self, standard_pixmap):
+        """スタイルの標準アイコンを取得（一度生成したものを再利用）"""
+        icon = _STANDARD_ICONS.get(standard_pixmap)
+        if icon is None:
+            icon = self.style().standardIcon(standard_pixmap)
+            _STANDARD_ICONS[standard_pixmap] = icon
+        return icon
+
     def setup_ui(self):
         self.setWindowTitle("バッチ切り抜きツール（画像・動画対応）")
         self.setGeometry(100, 100, 1200, 800)
@@ -999,7 +2332,7 @@ class BatchImageCropper(QMainWindow):
 
         # ファイルを追加ボタン
         load_btn = QPushButton("ファイルを追加...")
-        load_btn.setIcon(self.style().standardIcon(self.style().StandardPixmap.SP_DialogOpenButton))
+        load_btn.setIcon(self.standard_icon(QStyle.StandardPixmap.SP_DialogOpenButton))
         load_btn.setMinimumHeight(40)
         load_btn.setToolTip("切り抜きたい画像・動画ファイルを選択します\n(画像: PNG, JPG, BMP, GIF / 動画: MP4, AVI, MOV, MKV等)")
         load_btn.clicked.connect(self.load_images)
@@ -1007,7 +2340,7 @@ class BatchImageCropper(QMainWindow):
 
         # 選択したファイルを削除ボタン
         remove_btn = QPushButton("選択したファイルを削除")
-        remove_btn.setIcon(self.style().standardIcon(self.style().StandardPixmap.SP_DialogDiscardButton))
+        remove_btn.setIcon(self.standard_icon(QStyle.StandardPixmap.SP_DialogDiscardButton))
         remove_btn.setMinimumHeight(40)
         remove_btn.setToolTip("リストで選択中のファイルを削除します\n(Ctrl/Shiftキーで複数選択可能)")
         remove_btn.clicked.connect(self.remove_selected_images)
@@ -1015,7 +2348,7 @@ class BatchImageCropper(QMainWindow):
 
         # リストをクリアボタン
         clear_btn = QPushButton("リストをクリア")
-        clear_btn.setIcon(self.style().standardIcon(self.style().StandardPixmap.SP_DialogResetButton))
+        clear_btn.setIcon(self.standard_icon(QStyle.StandardPixmap.SP_DialogResetButton))
         clear_btn.setMinimumHeight(40)
         clear_btn.setToolTip("すべてのファイルをリストから削除します")
         clear_btn.clicked.connect(self.clear_list)
@@ -1027,8 +2360,14 @@ class BatchImageCropper(QMainWindow):
         list_group = QGroupBox("ファイルリスト")
         list_layout = QVBoxLayout()
 
-        self.file_list = QListWidget()
-        self.file_list.itemClicked.connect(self.on_image_selected)
+        # 行ごとにウィジェットを作らず、モデルの値をデリゲートで描画する
+        self.file_model = FileListModel(self)
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
+        self.file_list.setItemDelegate(FileListDelegate(self.file_list))
+        # 行の高さはすべて同じなので、レイアウト時に行ごとのsizeHintを問い合わせない
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.clicked.connect(self.on_image_selected)
         self.file_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.file_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.file_list.customContextMenuRequested.connect(self.show_context_menu)
@@ -1050,6 +2389,7 @@ class BatchImageCropper(QMainWindow):
         crop_layout = QVBoxLayout()
 
         self.crop_info_label = QLabel("切り抜き範囲: 未設定")
+        self.crop_info_label.installEventFilter(self)
         crop_layout.addWidget(self.crop_info_label)
 
         # X, Y 座標
@@ -1129,13 +2469,93 @@ class BatchImageCropper(QMainWindow):
 
         crop_group.setLayout(crop_layout)
         left_layout.addWidget(crop_group)
+
+        encode_group = QGroupBox("動画エンコード（GPU）")
+        encode_group.setToolTip("NVIDIA GPU（NVENC）で動画をエンコードする場合の設定です")
+        encode_layout = QVBoxLayout()
+
+        # 速度・用途・マルチパスをまとめて切り替える設定（NVENC_PROFILES）
+        profile_layout = QHBoxLayout()
+        profile_layout.addWidget(QLabel("設定:"))
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItem("標準", 'balanced')
+        self.profile_combo.addItem("高画質", 'quality')
+        self.profile_combo.addItem("速度優先（一括処理向け）", 'speed')
+        self.profile_combo.addItem("カスタム", 'custom')  # NVENC_PROFILESにない＝個別の設定
+        self.profile_combo.setToolTip("速度・用途をまとめて設定します\n（速度・用途を個別に変更するとカスタムになります）")
+        self.profile_combo.currentIndexChanged.connect(self.on_encode_profile_changed)
+        profile_layout.addWidget(self.profile_combo)
+        encode_layout.addLayout(profile_layout)
+
+        # コーデック、プリセット
+        codec_layout = QHBoxLayout()
+        codec_layout.addWidget(QLabel("形式:"))
+        self.codec_combo = QComboBox()
+        self.codec_combo.addItem("H.264", 'h264')
+        self.codec_combo.addItem("HEVC", 'hevc')
+        self.codec_combo.setToolTip("出力する動画のコーデック")
+        codec_layout.addWidget(self.codec_combo)
+
+        codec_layout.addWidget(QLabel("速度:"))
+        self.preset_combo = QComboBox()
+        for level in range(1, 8):
+            label = {1: "p1 (最速)", 4: "p4 (標準)", 7: "p7 (高画質)"}.get(level, f"p{level}")
+            self.preset_combo.addItem(label, f"p{level}")
+        self.preset_combo.setCurrentIndex(self.preset_combo.findData(DEFAULT_ENCODE_OPTS['preset']))
+        self.preset_combo.setToolTip("エンコードの速度と画質のバランス\n（p1ほど高速、p7ほど高画質）")
+        self.preset_combo.currentIndexChanged.connect(self.on_encode_detail_changed)
+        codec_layout.addWidget(self.preset_combo)
+        encode_layout.addLayout(codec_layout)
+
+        # チューニング、レート制御
+        tune_layout = QHBoxLayout()
+        tune_layout.addWidget(QLabel("用途:"))
+        self.tune_combo = QComboBox()
+        self.tune_combo.addItem("高画質", 'hq')
+        self.tune_combo.addItem("低遅延", 'll')
+        self.tune_combo.addItem("超低遅延（高速）", 'ull')
+        self.tune_combo.addItem("ロスレス", 'lossless')
+        self.tune_combo.setToolTip("エンコーダーのチューニング")
+        self.tune_combo.currentIndexChanged.connect(self.on_encode_detail_changed)
+        tune_layout.addWidget(self.tune_combo)
+
+        tune_layout.addWidget(QLabel("レート:"))
+        self.rc_combo = QComboBox()
+        self.rc_combo.addItem("品質指定", 'vbr')
+        self.rc_combo.addItem("固定ビットレート", 'cbr')
+        self.rc_combo.addItem("固定QP", 'constqp')
+        self.rc_combo.setToolTip("レート制御の方式")
+        self.rc_combo.currentIndexChanged.connect(self.on_rate_control_changed)
+        tune_layout.addWidget(self.rc_combo)
+        encode_layout.addLayout(tune_layout)
+
+        # 品質、ビットレート
+        quality_layout = QHBoxLayout()
+        quality_layout.addWidget(QLabel("品質:"))
+        self.cq_spin = QSpinBox()
+        self.cq_spin.setRange(0, 51)
+        self.cq_spin.setValue(DEFAULT_ENCODE_OPTS['cq'])
+        self.cq_spin.setToolTip("品質（0-51、低いほど高品質・大きいファイル）")
+        quality_layout.addWidget(self.cq_spin)
+
+        quality_layout.addWidget(QLabel("Mbps:"))
+        self.bitrate_spin = QSpinBox()
+        self.bitrate_spin.setRange(1, 200)
+        self.bitrate_spin.setValue(int(DEFAULT_ENCODE_OPTS['bitrate'].rstrip('M')))
+        self.bitrate_spin.setToolTip("固定ビットレート時のビットレート")
+        self.bitrate_spin.setEnabled(False)
+        quality_layout.addWidget(self.bitrate_spin)
+        encode_layout.addLayout(quality_layout)
+
+        encode_group.setLayout(encode_layout)
+        left_layout.addWidget(encode_group)
         
         action_group = QGroupBox("操作")
         action_layout = QVBoxLayout()
 
         # 切り抜いて保存ボタン
         self.crop_and_save_btn = QPushButton("切り抜いて保存...")
-        self.crop_and_save_btn.setIcon(self.style().standardIcon(self.style().StandardPixmap.SP_DialogSaveButton))
+        self.crop_and_save_btn.setIcon(self.standard_icon(QStyle.StandardPixmap.SP_DialogSaveButton))
         self.crop_and_save_btn.setMinimumHeight(50)
         self.crop_and_save_btn.setToolTip("設定した範囲で切り抜き、\n保存先フォルダに保存します")
         self.crop_and_save_btn.clicked.connect(self.crop_and_save_images)
@@ -1149,6 +2569,22 @@ class BatchImageCropper(QMainWindow):
 
         action_layout.addWidget(self.crop_and_save_btn)
 
+        # 動画の無劣化切り抜き
+        self.lossless_video_checkbox = QCheckBox("可能な場合は動画を無劣化で切り抜く")
+        self.lossless_video_checkbox.setToolTip(
+            "H.264/HEVCの動画で切り抜き範囲が16ピクセル単位に揃っている場合、\n"
+            "再エンコードせずに切り抜きます（高速・画質劣化なし）"
+        )
+        action_layout.addWidget(self.lossless_video_checkbox)
+
+        # 同じ形式の動画をまとめてエンコード
+        self.concat_video_checkbox = QCheckBox("同じ形式の動画をまとめてエンコードする")
+        self.concat_video_checkbox.setToolTip(
+            "コーデック・解像度・フレームレートが同じ動画を1回のffmpegでつなげてエンコードし、\n"
+            "元の動画ごとに分割し直します（短い動画が多い場合に高速）"
+        )
+        action_layout.addWidget(self.concat_video_checkbox)
+
         action_group.setLayout(action_layout)
         left_layout.addWidget(action_group)
         
@@ -1159,15 +2595,9 @@ class BatchImageCropper(QMainWindow):
         self.image_viewer.cropChanging.connect(self.on_crop_changing)  # リアルタイム更新
         self.image_viewer.zoomChanged.connect(self.on_zoom_changed)  # ズーム率更新
 
-        # スクロールエリアで画像ビューアをラップ
-        scroll_area = QScrollArea()
-        scroll_area.setWidget(self.image_viewer)
-        scroll_area.setWidgetResizable(False)  # 拡大時にスクロールバーを表示
-        scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
         splitter = QSplitter(Qt.Orientation.Horizontal)
         splitter.addWidget(left_panel)
-        splitter.addWidget(scroll_area)
+        splitter.addWidget(self.image_viewer)
         splitter.setSizes([250, 950])
 
         # 左側のパネルは固定幅、右側の画像エリアだけが伸縮する
@@ -1176,7 +2606,7 @@ class BatchImageCropper(QMainWindow):
 
         # 両側のパネルに最小幅を設定（これ以上小さくできないようにする）
         left_panel.setMinimumWidth(200)
-        scroll_area.setMinimumWidth(400)
+        self.image_viewer.setMinimumWidth(400)
 
         main_layout.addWidget(splitter)
     
@@ -1192,71 +2622,78 @@ class BatchImageCropper(QMainWindow):
             self.add_media_files(files)
     
     def clear_list(self):
-        self.file_list.clear()
+        self.file_model.clear()
         self.image_files.clear()
-        self.image_sizes.clear()
-        self.file_types.clear()
+        self.image_files_set.clear()
+        self.file_meta.clear()
+        self.size_buckets.clear()
+        self.pending_files.clear()  # 取得中の結果は届いても捨てる
+        self.pending_size_groups.clear()
+        self.reset_viewer_state()
+
+    def reset_viewer_state(self):
+        """選択・画像ビューア・表示中の情報をファイル未選択の状態に戻す（リストの内容はそのまま）"""
         self.current_index = -1
+        self.last_spin_key = None
+        self.file_model.set_target_size(None)
         # 画像ビューアを適切にクリア
+        self.image_viewer.pending_image_path = None
+        self.image_viewer.clear_image_cache()
+        with _first_frame_cache_lock:
+            _first_frame_cache.clear()
         self.image_viewer.original_pixmap = None
-        self.image_viewer.display_pixmap = None
+        self.image_viewer.mip_levels = []
+        self.image_viewer.display_size = QSize()
         self.image_viewer.crop_rect = QRect()
-        self.image_viewer.setPixmap(QPixmap())  # 空のPixmapをセット
+        self.image_viewer.update()  # 背景だけを描画し直す
         self.crop_rect = QRect()
         self.update_crop_info()
         self.crop_and_save_btn.setEnabled(False)
         self.size_info_label.setText("ファイルサイズ: -")
         self.zoom_info_label.setText("ズーム: 100%")
     
-    def on_image_selected(self, item):
-        if not item:
+    def on_image_selected(self, index: QModelIndex):
+        if not index.isValid():
             return
 
-        file_path = item.data(Qt.ItemDataRole.UserRole)
-        self.current_index = self.file_list.row(item)
-
-        # 動画ファイルの場合はフレームを抽出
-        if is_video_file(file_path):
-            q_image = extract_first_frame(file_path)
-            if q_image:
-                pixmap = QPixmap.fromImage(q_image)
-                self.image_viewer.original_pixmap = pixmap
-                self.image_viewer.user_zoomed = False
-                self.image_viewer.fit_to_window()
-                QTimer.singleShot(0, self.image_viewer.center_image)
-
-                if file_path in self.image_sizes:
-                    size = self.image_sizes[file_path]
-                    file_type = self.file_types.get(file_path, 'unknown')
-                    type_label = "動画" if file_type == 'video' else "画像"
-                    self.size_info_label.setText(f"{type_label}サイズ: {size[0]}x{size[1]}")
-
-                    self.update_spin_ranges()
-                    self.update_list_item_styles()
-
-                if not self.crop_rect.isEmpty():
-                    self.image_viewer.set_crop_rect(self.crop_rect)
-        # 画像ファイルの場合は従来通り
-        elif self.image_viewer.set_image(file_path):
-            if file_path in self.image_sizes:
-                size = self.image_sizes[file_path]
-                file_type = self.file_types.get(file_path, 'image')
-                type_label = "動画" if file_type == 'video' else "画像"
-                self.size_info_label.setText(f"{type_label}サイズ: {size[0]}x{size[1]}")
-
-                self.update_spin_ranges()
-                self.update_list_item_styles()
+        file_path = index.data(Qt.ItemDataRole.UserRole)
+        self.current_index = index.row()
+        self.last_spin_key = None  # ファイルが変わったら範囲を計算し直す
 
-            if not self.crop_rect.isEmpty():
-                self.image_viewer.set_crop_rect(self.crop_rect)
+        # 画像のデコード・動画のフレーム抽出はワーカースレッドで行う（先読み済みならすぐ表示）
+        self.image_viewer.set_image(file_path)
+        file_meta = self.file_meta.get(file_path)
+        if file_meta:
+            size = file_meta.size
+            type_label = "動画" if file_meta.file_type == 'video' else "画像"
+            self.size_info_label.setText(f"{type_label}サイズ: {size[0]}x{size[1]}")
+
+            self.update_spin_ranges()
+            self.update_list_item_styles()
+
+        if not self.crop_rect.isEmpty():
+            self.image_viewer.set_crop_rect(self.crop_rect)
+
+        self.preload_neighbors(self.current_index)
+
+    def preload_neighbors(self, index: int):
+        """リストの前後のファイルを先読み（選択を移動した時にすぐ表示できるように）"""
+        for neighbor in (index + 1, index - 1):
+            if 0 <= neighbor < len(self.image_files):
+                self.image_viewer.preload_image(self.image_files[neighbor])
     
     def on_crop_changed(self, rect: QRect):
+        # ドラッグ中の通知で反映済みなら何もしない
+        if rect == self.crop_rect:
+            return
         self.crop_rect = rect
         self.update_crop_info()
         self.crop_and_save_btn.setEnabled(not rect.isEmpty() and len(self.image_files) > 0)
 
     def on_crop_changing(self, rect: QRect):
         """マウス操作中のリアルタイム更新"""
+        if rect == self.crop_rect:
+            return
         self.crop_rect = rect
         self.update_crop_info()
         self.crop_and_save_btn.setEnabled(not rect.isEmpty() and len(self.image_files) > 0)
@@ -1266,35 +2703,19 @@ class BatchImageCropper(QMainWindow):
         if self.current_index < 0 or self.current_index >= len(self.image_files):
             return
 
-        current_file = self.image_files[self.current_index]
-        if current_file not in self.image_sizes:
+        file_meta = self.file_meta.get(self.image_files[self.current_index])
+        if not file_meta:
             return
 
-        current_size = self.image_sizes[current_file]
-        same_size_count = 0
-
-        for i in range(self.file_list.count()):
-            item = self.file_list.item(i)
-            file_path = item.data(Qt.ItemDataRole.UserRole)
-
-            if file_path in self.image_sizes:
-                size = self.image_sizes[file_path]
-                is_same_size = (size == current_size)
-
-                # カスタムウィジェットのスタイルを更新
-                widget = self.file_list.itemWidget(item)
-                if widget and isinstance(widget, FileListItemWidget):
-                    widget.set_enabled_style(is_same_size)
-
-                if is_same_size:
-                    # 処理対象
-                    item.setToolTip(f"サイズ: {size[0]}x{size[1]}\n✓ このファイルは切り抜き処理されます")
-                    same_size_count += 1
-                else:
-                    # スキップ対象
-                    item.setToolTip(f"サイズ: {size[0]}x{size[1]}\n✗ サイズが異なるためスキップされます")
+        # 各行の色・ツールチップは描画時にモデルが決めるので、処理対象のサイズを渡すだけでよい
+        # （選択中のサイズが変わらなければ何もしない）
+        self.file_model.set_target_size(file_meta.size)
+        self.update_target_count()
 
-        # ボタンのツールチップを更新
+    def update_target_count(self):
+        """処理対象のファイル数をボタンのツールチップに表示（ファイルの追加・削除時は行の表示は変わらない）"""
+        target_size = self.file_model.target_size
+        same_size_count = len(self.size_buckets.get(target_size, ())) if target_size else 0
         if same_size_count > 0:
             self.crop_and_save_btn.setToolTip(
                 f"設定した範囲で切り抜き、\n保存先フォルダに保存します\n\n処理対象: {same_size_count}ファイル"
@@ -1305,17 +2726,11 @@ class BatchImageCropper(QMainWindow):
         if self.current_index < 0 or self.current_index >= len(self.image_files):
             return
 
-        current_file = self.image_files[self.current_index]
-        if current_file not in self.image_sizes:
+        file_meta = self.file_meta.get(self.image_files[self.current_index])
+        if not file_meta:
             return
 
-        img_width, img_height = self.image_sizes[current_file]
-
-        # シグナルをブロックして無限ループを防ぐ
-        self.x_spin.blockSignals(True)
-        self.y_spin.blockSignals(True)
-        self.width_spin.blockSignals(True)
-        self.height_spin.blockSignals(True)
+        img_width, img_height = file_meta.size
 
         # 現在の値を取得
         x = self.x_spin.value()
@@ -1323,35 +2738,38 @@ class BatchImageCropper(QMainWindow):
         width = self.width_spin.value()
         height = self.height_spin.value()
 
-        # X の最大値: 画像幅 - 幅
-        x_max = max(0, img_width - width)
-        self.x_spin.setRange(0, x_max)
-        if x > x_max:
-            self.x_spin.setValue(x_max)
-
-        # Y の最大値: 画像高さ - 高さ
-        y_max = max(0, img_height - height)
-        self.y_spin.setRange(0, y_max)
-        if y > y_max:
-            self.y_spin.setValue(y_max)
-
-        # 幅の最大値: 画像幅 - X
-        width_max = img_width - x
-        self.width_spin.setRange(1, width_max)
-        if width > width_max:
-            self.width_spin.setValue(width_max)
-
-        # 高さの最大値: 画像高さ - Y
-        height_max = img_height - y
-        self.height_spin.setRange(1, height_max)
-        if height > height_max:
-            self.height_spin.setValue(height_max)
-
-        # シグナルを再有効化
-        self.x_spin.blockSignals(False)
-        self.y_spin.blockSignals(False)
-        self.width_spin.blockSignals(False)
-        self.height_spin.blockSignals(False)
+        # 画像サイズと値が前回と同じなら範囲も同じなので何もしない（ドラッグ中に頻繁に呼ばれる）
+        spin_key = (img_width, img_height, x, y, width, height)
+        if spin_key == self.last_spin_key:
+            return
+        self.last_spin_key = spin_key
+
+        # シグナルをブロックして無限ループを防ぐ（範囲と値の変更による再描画も最後にまとめる）
+        spins = self.crop_spins()
+        with suspend_updates(*spins), block_signals(*spins):
+            # X の最大値: 画像幅 - 幅
+            x_max = max(0, img_width - width)
+            self.x_spin.setRange(0, x_max)
+            if x > x_max:
+                self.x_spin.setValue(x_max)
+
+            # Y の最大値: 画像高さ - 高さ
+            y_max = max(0, img_height - height)
+            self.y_spin.setRange(0, y_max)
+            if y > y_max:
+                self.y_spin.setValue(y_max)
+
+            # 幅の最大値: 画像幅 - X
+            width_max = img_width - x
+            self.width_spin.setRange(1, width_max)
+            if width > width_max:
+                self.width_spin.setValue(width_max)
+
+            # 高さの最大値: 画像高さ - Y
+            height_max = img_height - y
+            self.height_spin.setRange(1, height_max)
+            if height > height_max:
+                self.height_spin.setValue(height_max)
 
     def on_crop_spin_changed(self):
         """スピンボックスの値が変更されたとき"""
@@ -1368,6 +2786,40 @@ class BatchImageCropper(QMainWindow):
         self.image_viewer.set_crop_rect(self.crop_rect)
         self.crop_and_save_btn.setEnabled(not self.crop_rect.isEmpty() and len(self.image_files) > 0)
 
+    def on_rate_control_changed(self):
+        """レート制御の方式に応じて品質とビットレートの入力を切り替え"""
+        is_cbr = self.rc_combo.currentData() == 'cbr'
+        self.cq_spin.setEnabled(not is_cbr)
+        self.bitrate_spin.setEnabled(is_cbr)
+
+    def on_encode_profile_changed(self):
+        """エンコード設定のプロファイルを選んだら、速度・用途の選択をそれに合わせる"""
+        profile = NVENC_PROFILES.get(self.profile_combo.currentData())
+        if profile is None:
+            return
+        # 個別の変更として扱わない（カスタムに切り替わらない）ようにシグナルを止める
+        with block_signals(self.preset_combo, self.tune_combo):
+            self.preset_combo.setCurrentIndex(self.preset_combo.findData(profile['preset']))
+            self.tune_combo.setCurrentIndex(self.tune_combo.findData(profile['tune']))
+
+    def on_encode_detail_changed(self):
+        """速度・用途を個別に変更したら、プロファイルの選択をカスタムにする"""
+        with block_signals(self.profile_combo):
+            self.profile_combo.setCurrentIndex(self.profile_combo.findData('custom'))
+
+    def get_encode_opts(self) -> dict:
+        """画面で指定された動画エンコード設定を取得"""
+        profile = NVENC_PROFILES.get(self.profile_combo.currentData(), {})
+        return normalize_encode_opts({
+            'codec': self.codec_combo.currentData(),
+            'preset': self.preset_combo.currentData(),
+            'tune': self.tune_combo.currentData(),
+            'rc': self.rc_combo.currentData(),
+            'cq': self.cq_spin.value(),
+            'bitrate': f"{self.bitrate_spin.value()}M",
+            'multipass': profile.get('multipass', DEFAULT_ENCODE_OPTS['multipass']),
+        })
+
     def on_zoom_changed(self, scale_factor: float):
         """ズーム率変更時の更新"""
         zoom_percent = scale_factor * 100
@@ -1419,45 +2871,45 @@ class BatchImageCropper(QMainWindow):
             ratio = self.custom_width_spin.value() / self.custom_height_spin.value()
             self.image_viewer.set_aspect_ratio(True, ratio)
 
+    def crop_spins(self):
+        """切り抜き範囲のスピンボックス（X, Y, 幅, 高さ）"""
+        return (self.x_spin, self.y_spin, self.width_spin, self.height_spin)
+
+    def set_crop_spin_values(self, x: int, y: int, width: int, height: int):
+        """シグナルを発生させずにスピンボックスの値をまとめて設定（再描画も最後に1回）"""
+        spins = self.crop_spins()
+        with suspend_updates(*spins), block_signals(*spins):
+            self.x_spin.setValue(x)
+            self.y_spin.setValue(y)
+            self.width_spin.setValue(width)
+            self.height_spin.setValue(height)
+
     def update_crop_info(self):
+        # ラベルが表示されていなければ文字列の作成を省き、表示された時に更新する
+        if self.crop_info_label.isVisible():
+            self.update_crop_info_label()
+
         if self.crop_rect.isEmpty():
-            self.crop_info_label.setText("切り抜き範囲: 未設定")
-            self.x_spin.blockSignals(True)
-            self.y_spin.blockSignals(True)
-            self.width_spin.blockSignals(True)
-            self.height_spin.blockSignals(True)
-
-            self.x_spin.setValue(0)
-            self.y_spin.setValue(0)
-            self.width_spin.setValue(0)
-            self.height_spin.setValue(0)
-
-            self.x_spin.blockSignals(False)
-            self.y_spin.blockSignals(False)
-            self.width_spin.blockSignals(False)
-            self.height_spin.blockSignals(False)
+            self.set_crop_spin_values(0, 0, 0, 0)
         else:
-            self.crop_info_label.setText(
-                f"切り抜き範囲: ({self.crop_rect.x()}, {self.crop_rect.y()}) - "
-                f"{self.crop_rect.width()}x{self.crop_rect.height()}"
-            )
-            self.x_spin.blockSignals(True)
-            self.y_spin.blockSignals(True)
-            self.width_spin.blockSignals(True)
-            self.height_spin.blockSignals(True)
-
-            self.x_spin.setValue(self.crop_rect.x())
-            self.y_spin.setValue(self.crop_rect.y())
-            self.width_spin.setValue(self.crop_rect.width())
-            self.height_spin.setValue(self.crop_rect.height())
-
-            self.x_spin.blockSignals(False)
-            self.y_spin.blockSignals(False)
-            self.width_spin.blockSignals(False)
-            self.height_spin.blockSignals(False)
+            self.set_crop_spin_values(*self.crop_rect.getRect())
 
             # スピンボックスの範囲も更新
             self.update_spin_ranges()
+
+    def update_crop_info_label(self):
+        """切り抜き範囲のラベルを現在の crop_rect で更新"""
+        if self.crop_rect.isEmpty():
+            self.crop_info_label.setText("切り抜き範囲: 未設定")
+        else:
+            x, y, width, height = self.crop_rect.getRect()
+            self.crop_info_label.setText(f"切り抜き範囲: ({x}, {y}) - {width}x{height}")
+
+    def eventFilter(self, watched, event):
+        # 非表示の間に更新を省いたラベルを、表示された時に最新にする
+        if watched is self.crop_info_label and event.type() == QEvent.Type.Show:
+            self.update_crop_info_label()
+        return super().eventFilter(watched, event)
     
     def crop_and_save_images(self):
         """切り抜きと保存を一度に実行"""
@@ -1476,12 +2928,11 @@ class BatchImageCropper(QMainWindow):
 
         # 現在選択中のファイルと同じサイズのファイルすべてを対象にする
         current_file = self.image_files[self.current_index]
-        current_size = self.image_sizes.get(current_file)
-        files_to_crop = [f for f in self.image_files if self.image_sizes.get(f) == current_size]
+        files_to_crop = list(self.size_buckets.get(self.file_meta[current_file].size, ()))
 
         # 画像と動画を分ける
-        image_files = [f for f in files_to_crop if self.file_types.get(f) == 'image']
-        video_files = [f for f in files_to_crop if self.file_types.get(f) == 'video']
+        image_files = [f for f in files_to_crop if self.file_meta[f].file_type == 'image']
+        video_files = [f for f in files_to_crop if self.file_meta[f].file_type == 'video']
 
         # 動画ファイルが含まれている場合、ffmpegの確認
         if video_files and not check_ffmpeg_available():
@@ -1513,28 +2964,35 @@ class BatchImageCropper(QMainWindow):
             progress = QProgressDialog("画像ファイルを処理中...", "キャンセル", 0, len(image_files), self)
             progress.setWindowModality(Qt.WindowModality.WindowModal)
 
-            for i, file_path in enumerate(image_files):
-                if progress.wasCanceled():
-                    break
-
-                progress.setValue(i)
-                filename = os.path.basename(file_path)
-                progress.setLabelText(f"処理中: {filename}")
-
-                image = QImage(file_path)
-                if not image.isNull():
-                    cropped = image.copy(self.crop_rect)
-                    name, ext = os.path.splitext(filename)
-                    save_path = os.path.join(folder, f"{name}_cropped{ext}")
-
-                    counter = 1
-                    while os.path.exists(save_path):
-                        save_path = os.path.join(folder, f"{name}_cropped_{counter}{ext}")
-                        counter += 1
-
-                    if cropped.save(save_path):
+            # 読み込み・切り抜き・保存はファイルごとに独立しているので、ワーカースレッドで並列に実行
+            # （QImageはメインスレッド以外でも使え、デコード・エンコード中はGILが解放される）
+            crop_rect = QRect(self.crop_rect)
+            with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+                # プレビュー用にデコード済みの画像（表示中・先読み済み）はそのまま使う
+                futures = {
+                    executor.submit(crop_and_save_image, file_path, crop_rect, folder,
+                                    self.file_meta[file_path].image_meta,
+                                    self.image_viewer.image_cache.get(file_path)): file_path
+                    for file_path in image_files
+                }
+                counted = set()
+                for done, future in enumerate(as_completed(futures), 1):
+                    counted.add(future)
+                    if future.result():
                         saved_count += 1
 
+                    progress.setValue(done)
+                    progress.setLabelText(f"処理中: {os.path.basename(futures[future])}")
+                    if progress.wasCanceled():
+                        # 開始前のファイルは取り消す
+                        for pending in futures:
+                            pending.cancel()
+                        # 取り消せなかった（実行中の）ファイルは保存されるので、完了を待って数える
+                        for running in futures:
+                            if running not in counted and not running.cancelled() and running.result():
+                                saved_count += 1
+                        break
+
             progress.setValue(len(image_files))
 
         # 動画ファイルを別スレッドで処理
@@ -1549,13 +3007,18 @@ class BatchImageCropper(QMainWindow):
             self.video_progress.setWindowModality(Qt.WindowModality.WindowModal)
             self.video_progress.setMinimumDuration(0)
             self.video_progress.setValue(0)
+            self.video_file_percents = [0] * len(video_files)
+            self.progress_clock.invalidate()
 
             # スレッドを作成して開始
             self.video_thread = VideoProcessorThread(
                 video_files,
                 self.crop_rect,
                 folder,
-                use_gpu=use_gpu
+                use_gpu=use_gpu,
+                encode_opts=self.get_encode_opts(),
+                lossless=self.lossless_video_checkbox.isChecked(),
+                concat_batches=self.concat_video_checkbox.isChecked()
             )
 
             # シグナルを接続
@@ -1575,8 +3038,15 @@ class BatchImageCropper(QMainWindow):
     def on_video_progress_updated(self, file_index: int, percent: float):
         """動画処理の進捗更新"""
         if hasattr(self, 'video_progress'):
-            total_percent = file_index * 100 + int(percent)
-            self.video_progress.setValue(total_percent)
+            # 複数ファイルが並列に処理されるため、ファイルごとの進捗の合計を表示
+            self.video_file_percents[file_index] = int(percent)
+            # 表示の更新は一定間隔ごと（ffmpegの進捗は頻繁に届くので、毎回ダイアログを描き直さない）
+            # 完了時は必ず更新する
+            if (percent < 100 and self.progress_clock.isValid()
+                    and self.progress_clock.elapsed() < PROGRESS_UPDATE_INTERVAL_MS):
+                return
+            self.progress_clock.start()
+            self.video_progress.setValue(sum(self.video_file_percents))
 
             if hasattr(self, 'video_thread') and self.video_thread:
                 filename = os.path.basename(self.video_thread.files_to_process[file_index])
@@ -1586,7 +3056,9 @@ class BatchImageCropper(QMainWindow):
 
     def on_video_file_completed(self, file_index: int, success: bool):
         """動画ファイルの処理完了"""
-        pass  # 必要に応じてログなどを追加
+        if hasattr(self, 'video_progress'):
+            self.video_file_percents[file_index] = 100
+            self.video_progress.setValue(sum(self.video_file_percents))
 
     def on_all_videos_completed(self, video_saved_count: int, image_saved_count: int):
         """すべての動画処理が完了"""
@@ -1621,34 +3093,42 @@ class BatchImageCropper(QMainWindow):
     
     def remove_selected_images(self):
         """選択された画像をリストから削除"""
-        selected_items = self.file_list.selectedItems()
-        if not selected_items:
+        rows = [index.row() for index in self.file_list.selectionModel().selectedIndexes()]
+        if not rows:
             return
 
-        for item in selected_items:
-            file_path = item.data(Qt.ItemDataRole.UserRole)
-            row = self.file_list.row(item)
-            self.file_list.takeItem(row)
+        removed_files = {self.file_model.paths[row] for row in rows}
+        with suspend_updates(self.file_list):
+            self.file_model.remove_rows(rows)
 
-            if file_path in self.image_files:
-                self.image_files.remove(file_path)
-            if file_path in self.image_sizes:
-                del self.image_sizes[file_path]
+        for file_path in removed_files:
+            self.image_files_set.discard(file_path)
+            file_meta = self.file_meta.pop(file_path, None)
+            if file_meta:
+                bucket = self.size_buckets.get(file_meta.size)
+                if bucket is not None:
+                    bucket.pop(file_path, None)
+                    if not bucket:
+                        del self.size_buckets[file_meta.size]
+
+        # ファイル一覧から取り除く
+        self.image_files = [f for f in self.image_files if f not in removed_files]
 
         # リストが空になったら画像ビューアもクリア
+        # （リストと各データは削除済み。追加中のファイルはそのまま取得を続ける）
         if not self.image_files:
-            self.clear_list()
+            self.reset_viewer_state()
         # まだ画像があれば最初の画像を選択
-        elif self.file_list.count() > 0:
-            self.file_list.setCurrentRow(0)
-            self.on_image_selected(self.file_list.item(0))
-        # 選択はそのままで、リストの表示だけ更新
+        elif self.file_model.rowCount() > 0:
+            self.file_list.setCurrentIndex(self.file_model.index(0))
+            self.on_image_selected(self.file_model.index(0))
+        # 選択はそのままで、処理対象の数だけ更新
         elif self.current_index >= 0:
-            self.update_list_item_styles()
+            self.update_target_count()
     
     def show_context_menu(self, position):
         """ファイルリストの右クリックメニュー"""
-        if not self.file_list.selectedItems():
+        if not self.file_list.selectionModel().hasSelection():
             return
         
         menu = QMenu(self)
@@ -1669,9 +3149,10 @@ class BatchImageCropper(QMainWindow):
             # 画像・動画ファイルかチェック
             for url in event.mimeData().urls():
                 if url.isLocalFile():
-                    file_path = url.toLocalFile()
-                    if is_image_file(file_path) or is_video_file(file_path):
-                        event.acceptProposedAction()
+                    if is_media_file(url.toLocalFile()):
+                        # ファイルはコピーとして受け取る（移動などの操作を問い合わせない）
+                        event.setDropAction(Qt.DropAction.CopyAction)
+                        event.accept()
                         return
             event.ignore()
         else:
@@ -1683,76 +3164,82 @@ class BatchImageCropper(QMainWindow):
         for url in event.mimeData().urls():
             if url.isLocalFile():
                 file_path = url.toLocalFile()
-                if is_image_file(file_path) or is_video_file(file_path):
+                if is_media_file(file_path):
                     files.append(file_path)
 
         if files:
             self.add_media_files(files)
     
     def add_media_files(self, files):
-        """画像・動画ファイルをリストに追加（共通処理）"""
-        size_groups = {}
+        """画像・動画ファイルをリストに追加（共通処理）
 
+        サイズの取得はワーカースレッドで行い、届いた結果を追加した順にまとめてリストへ反映する。
+        """
         for file in files:
-            if file not in self.image_files:
-                size = None
-                file_type = None
-
-                # 動画ファイルの場合
-                if is_video_file(file):
-                    size = get_video_info(file)
-                    file_type = 'video'
-                    if size:
-                        self.image_sizes[file] = size
-                        self.file_types[file] = file_type
-                # 画像ファイルの場合
-                elif is_image_file(file):
-                    image = QImage(file)
-                    if not image.isNull():
-                        size = (image.width(), image.height())
-                        file_type = 'image'
-                        self.image_sizes[file] = size
-                        self.file_types[file] = file_type
-
-                if size:
-                    size_key = f"{size[0]}x{size[1]}"
-                    if size_key not in size_groups:
-                        size_groups[size_key] = []
-                    size_groups[size_key].append(file)
-
-                    self.image_files.append(file)
-
-                    # カスタムウィジェットを作成
-                    filename = os.path.basename(file)
-                    size_text = f"{size[0]} × {size[1]}"
-                    widget = FileListItemWidget(filename, size_text, file_type)
-
-                    # リストアイテムを作成
-                    item = QListWidgetItem()
-                    item.setData(Qt.ItemDataRole.UserRole, file)
-                    item.setSizeHint(widget.sizeHint())
-
-                    type_label = "動画" if file_type == 'video' else "画像"
-                    item.setToolTip(f"{type_label}\nサイズ: {size[0]}x{size[1]}")
-
-                    self.file_list.addItem(item)
-                    self.file_list.setItemWidget(item, widget)
-
-        if len(size_groups) > 1:
-            sizes_text = "\n".join([f"- {size}: {len(files)}個" for size, files in size_groups.items()])
-            QMessageBox.information(
-                self,
-                "異なるサイズのファイルを検出",
-                f"複数のファイルサイズが検出されました:\n{sizes_text}\n\n"
-                "切り抜き処理は、選択中のファイルと同じサイズのファイルのみに適用されます。"
-            )
+            if file in self.image_files_set or file in self.pending_files or not is_media_file(file):
+                continue
+            self.pending_files[file] = None
+            task = MetadataTask(file)
+            task.signals.finished.connect(self.on_metadata_loaded)
+            self.metadata_pool.start(task)
+
+    def on_metadata_loaded(self, file_path: str, file_type: str, size, meta):
+        """ファイル情報の取得完了時（メインスレッドで呼ばれる）"""
+        # 取得中にリストがクリアされた場合は捨てる
+        if file_path not in self.pending_files:
+            return
+        self.pending_files[file_path] = (file_type, size, meta)
+        if not self.metadata_flush_timer.isActive():
+            self.metadata_flush_timer.start()
+
+    def flush_pending_files(self):
+        """取得済みのファイル情報を追加した順にリストへ反映"""
+        entries = []  # リストに追加する (file_path, size, file_type)
+        while self.pending_files:
+            file, result = next(iter(self.pending_files.items()))
+            if result is None:
+                break  # 先に追加したファイルの結果を待つ（リストの順番を保つ）
+            del self.pending_files[file]
+            file_type, size, meta = result
+            if not size:
+                continue
+
+            self.file_meta[file] = FileMeta(size, file_type, meta)
+
+            self.pending_size_groups.setdefault(size, []).append(file)
+
+            self.image_files.append(file)
+            self.image_files_set.add(file)
+            self.size_buckets[size][file] = None
+
+            entries.append((file, size, file_type))
+
+        # 行の表示に使う値だけをモデルにまとめて追加する（再描画・シグナルは最後に1回だけ）
+        with suspend_updates(self.file_list), block_signals(self.file_list):
+            self.file_model.append_files(entries)
+
+        # 今回追加したファイルのサイズがすべて揃ってから一度だけ知らせる
+        if not self.pending_files:
+            size_groups = self.pending_size_groups
+            self.pending_size_groups = {}
+            if len(size_groups) > 1:
+                # 操作を止めないよう、ダイアログではなくステータスバーに表示する
+                sizes_text = "、".join([f"{width}x{height}: {len(files)}個"
+                                       for (width, height), files in size_groups.items()])
+                self.statusBar().showMessage(
+                    f"異なるサイズのファイルを検出（{sizes_text}）"
+                    " — 切り抜き処理は選択中のファイルと同じサイズのファイルのみに適用されます",
+                    MIXED_SIZE_MESSAGE_MS
+                )
 
+        if not entries:
+            return
         if self.current_index == -1 and self.image_files:
-            self.file_list.setCurrentRow(0)
-            self.on_image_selected(self.file_list.item(0))
+            self.file_list.setCurrentIndex(self.file_model.index(0))
+            self.on_image_selected(self.file_model.index(0))
         elif self.current_index >= 0:
-            # 既にファイルが選択されている場合もリストのスタイルを更新
-            self.update_list_item_styles()
+            # 追加した行の表示は描画時に決まるので、処理対象の数だけ更新
+            self.update_target_count()
     
 
 